@@ -1,20 +1,38 @@
 """
 Simple JWT issue/verify for doctor login. Uses SECRET_KEY.
 """
+import base64
+import hashlib
+import hmac
+import re
 import time
+from functools import lru_cache
 from django.conf import settings
 import jwt
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # optional; stdlib json is the fallback
+    from json import loads as _json_loads
+
 JWT_ALGORITHM = "HS256"
 ACCESS_EXPIRY_SECONDS = 60 * 60 * 24  # 24 hours
 
 
+@lru_cache(maxsize=4)
+def _mac_template(secret_key: str):
+    # Keyed HMAC state per secret; verification copies it instead of re-deriving
+    # ipad/opad. Keyed on the current SECRET_KEY so rotation/override_settings apply.
+    return hmac.new(secret_key.encode("utf-8"), digestmod=hashlib.sha256)
+
+
 def make_access_token(user_id: int, email: str) -> str:
+    now = int(time.time())
     payload = {
         "sub": user_id,
         "email": email,
-        "exp": int(time.time()) + ACCESS_EXPIRY_SECONDS,
-        "iat": int(time.time()),
+        "exp": now + ACCESS_EXPIRY_SECONDS,
+        "iat": now,
         "type": "access",
     }
     raw = jwt.encode(
@@ -25,12 +43,57 @@ def make_access_token(user_id: int, email: str) -> str:
     return raw if isinstance(raw, str) else raw.decode("utf-8")
 
 
-def decode_access_token(token: str) -> dict | None:
+# header.payload.signature, each unpadded base64url. urlsafe_b64decode silently
+# drops characters outside the alphabet, so the shape is checked up front.
+_TOKEN_SHAPE = re.compile(r"[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+")
+
+
+def _b64url_decode(segment: bytes) -> bytes:
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+
+@lru_cache(maxsize=4096)
+def _decode_uncached(token: str, secret_key: str) -> dict | None:
+    # HS256 only: check header alg and signature directly rather than going
+    # through jwt.decode's option/claim machinery. Invalid tokens cache as None
+    # so repeated bad headers stay cheap; exp is checked by the caller. The
+    # secret is part of the cache key, so a rotated key never reuses a result.
     try:
-        return jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[JWT_ALGORITHM],
-        )
-    except jwt.InvalidTokenError:
+        raw = token.encode("ascii")
+        signing_input, _, signature_segment = raw.rpartition(b".")
+        header_segment, _, payload_segment = signing_input.partition(b".")
+        if not header_segment or not payload_segment or b"." in payload_segment:
+            return None
+        signature = _b64url_decode(signature_segment)
+        # Only the canonical encoding verifies (no stray trailing bits).
+        if base64.urlsafe_b64encode(signature).rstrip(b"=") != signature_segment:
+            return None
+        header = _json_loads(_b64url_decode(header_segment))
+        if not isinstance(header, dict) or header.get("alg") != JWT_ALGORITHM:
+            return None
+        mac = _mac_template(secret_key).copy()
+        mac.update(signing_input)
+        if not hmac.compare_digest(mac.digest(), signature):
+            return None
+        payload = _json_loads(_b64url_decode(payload_segment))
+    except (UnicodeError, ValueError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    exp = payload.get("exp")
+    if isinstance(exp, bool) or not isinstance(exp, (int, float)):
+        return None
+    return payload
+
+
+def decode_access_token(token: str) -> dict | None:
+    # Malformed strings are rejected before the cache so they cannot fill it.
+    if not isinstance(token, str) or not _TOKEN_SHAPE.fullmatch(token):
+        return None
+    payload = _decode_uncached(token, settings.SECRET_KEY)
+    if payload is None:
+        return None
+    # Cached payloads were valid when first decoded; re-check expiry on every hit.
+    if payload["exp"] <= time.time():
         return None
+    return dict(payload)
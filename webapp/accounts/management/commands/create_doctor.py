@@ -4,6 +4,7 @@ Usage: python manage.py create_doctor email@example.com password [--first-name "
 """
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
 
 User = get_user_model()
 
@@ -23,7 +24,7 @@ class Command(BaseCommand):
         first_name = (options.get("first_name") or "").strip()
         last_name = (options.get("last_name") or "").strip()
 
-        if User.objects.filter(email__iexact=email).exists():
+        if User.objects.annotate(email_lower=Lower("email")).filter(email_lower=email).exists():
             self.stdout.write(self.style.WARNING(f"User with email {email} already exists."))
             return
 
@@ -0,0 +1,17 @@
+# Functional index so case-insensitive email login is an index seek, not a scan.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS accounts_user_email_lower_idx ON auth_user (LOWER(email))",
+            "DROP INDEX IF EXISTS accounts_user_email_lower_idx",
+        ),
+    ]
@@ -0,0 +1,82 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+
+User = get_user_model()
+
+
+class DoctorAuthFlowTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="doc@example.com",
+            email="doc@example.com",
+            password="s3cret-pass",
+            first_name="Dana",
+            last_name="Doc",
+            is_staff=True,
+        )
+        self.client = Client()
+
+    def _login(self, email="doc@example.com", password="s3cret-pass"):
+        return self.client.post(
+            "/api/auth/login/",
+            data=json.dumps({"email": email, "password": password}),
+            content_type="application/json",
+        )
+
+    def test_login_then_me(self):
+        login_resp = self._login(email="DOC@Example.com")
+        self.assertEqual(login_resp.status_code, 200)
+        token = login_resp.json()["accessToken"]
+
+        me_resp = self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(me_resp.status_code, 200)
+        self.assertEqual(me_resp.json()["user"]["email"], "doc@example.com")
+
+    def test_me_rejects_tampered_token(self):
+        token = self._login().json()["accessToken"]
+        header, payload, signature = token.split(".")
+        replacement = "BB" if signature.endswith("AA") else "AA"
+        tampered = f"{header}.{payload}.{signature[:-2]}{replacement}"
+
+        me_resp = self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {tampered}")
+        self.assertEqual(me_resp.status_code, 401)
+
+    def test_me_rejects_non_base64url_characters(self):
+        token = self._login().json()["accessToken"]
+        header, payload, signature = token.split(".")
+        tampered_tokens = [
+            token + "!!!!",
+            token + "====",
+            f"{header}.{payload}.{signature[:10]}$$$${signature[10:]}",
+            f"{header}.{payload[:5]}$$$${payload[5:]}.{signature}",
+            f"{header}.{payload}=.{signature}",
+        ]
+        for tampered in tampered_tokens:
+            with self.subTest(token=tampered):
+                me_resp = self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {tampered}")
+                self.assertEqual(me_resp.status_code, 401)
+
+    def test_me_follows_secret_key_changes(self):
+        token = self._login().json()["accessToken"]
+        self.assertEqual(
+            self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {token}").status_code, 200
+        )
+
+        with override_settings(SECRET_KEY="rotated-secret-key-for-tests"):
+            stale = self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {token}")
+            self.assertEqual(stale.status_code, 401)
+            rotated = self._login().json()["accessToken"]
+            fresh = self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {rotated}")
+            self.assertEqual(fresh.status_code, 200)
+
+    def test_me_rejects_deleted_user(self):
+        token = self._login().json()["accessToken"]
+        self.assertEqual(
+            self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {token}").status_code, 200
+        )
+
+        self.user.delete()
+        me_resp = self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(me_resp.status_code, 401)
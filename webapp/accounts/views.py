@@ -6,12 +6,22 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_POST
 from django.contrib.auth import authenticate, get_user_model
+from django.db.models.functions import Lower
 
 from .auth_jwt import make_access_token, decode_access_token
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # optional; stdlib json is the fallback
+    from json import loads as _json_loads
+
 User = get_user_model()
 
 
+# Columns needed to render a user for /me; fetched with .values() (no model instance).
+_USER_JSON_FIELDS = ("id", "email", "first_name", "last_name")
+
+
 def _user_to_json(user):
     return {
         "id": user.pk,
@@ -21,7 +31,17 @@ def _user_to_json(user):
     }
 
 
+def _user_row_to_json(row):
+    return {
+        "id": row["id"],
+        "email": row["email"] or "",
+        "firstName": row["first_name"] or "",
+        "lastName": row["last_name"] or "",
+    }
+
+
 def _get_user_from_request(request):
+    """Return the token's user as a values() row dict, or None."""
     auth = request.headers.get("Authorization") or ""
     if not auth.startswith("Bearer "):
         return None
@@ -35,9 +55,10 @@ def _get_user_from_request(request):
     if user_id is None:
         return None
     try:
-        return User.objects.get(pk=int(user_id))
-    except (ValueError, User.DoesNotExist):
+        user_id = int(user_id)
+    except (TypeError, ValueError):
         return None
+    return User.objects.filter(pk=user_id).values(*_USER_JSON_FIELDS).first()
 
 
 @csrf_exempt
@@ -50,11 +71,12 @@ def login(request):
     Doctors are staff users; login by email (case-insensitive).
     """
     try:
-        body = json.loads(request.body) if request.body else {}
+        # orjson parses the request bytes directly; its JSONDecodeError subclasses json's.
+        body = _json_loads(request.body) if request.body else {}
     except json.JSONDecodeError:
         return JsonResponse({"detail": "Invalid JSON."}, status=400)
 
-    email = (body.get("email") or "").strip()
+    email = (body.get("email") or "").strip().lower()
     password = body.get("password") or ""
 
     if not email:
@@ -62,7 +84,8 @@ def login(request):
     if not password:
         return JsonResponse({"detail": "Password is required."}, status=400)
 
-    user = User.objects.filter(email__iexact=email).first()
+    # LOWER(email) = ? hits accounts_user_email_lower_idx; email__iexact compiles to LIKE.
+    user = User.objects.annotate(email_lower=Lower("email")).filter(email_lower=email).first()
     if not user:
         return JsonResponse({"detail": "Invalid email or password."}, status=401)
     if not user.check_password(password):
@@ -92,4 +115,4 @@ def me(request):
     user = _get_user_from_request(request)
     if not user:
         return JsonResponse({"detail": "Invalid or missing token."}, status=401)
-    return JsonResponse({"user": _user_to_json(user)})
+    return JsonResponse({"user": _user_row_to_json(user)})
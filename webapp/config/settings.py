@@ -84,10 +84,23 @@ WSGI_APPLICATION = 'config.wsgi.application'
 import os
 _db_dir = BASE_DIR / "data"
 os.makedirs(_db_dir, exist_ok=True)
+# Keep one connection per worker thread (CONN_MAX_AGE) instead of reconnecting on
+# every request; WAL lets dashboard reads proceed while a write is in flight.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': _db_dir / 'nfc_users.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'cached_statements': 256,
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA temp_store=MEMORY;'
+                'PRAGMA mmap_size=268435456;'
+            ),
+        },
     }
 }
 
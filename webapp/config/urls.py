@@ -18,7 +18,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
 
-from nfc_users.views import nfc_scan as nfc_scan_view
+from nfc_users.views import nfc_scan as nfc_scan_view, nfc_scan_batch as nfc_scan_batch_view
 
 
 def api_root(request):
@@ -35,6 +35,7 @@ def api_root(request):
             "/api/patients/<id>/",
             "/api/patients/by-nfc/<nfc_id>/",
             "/api/nfc/scan/",
+            "/api/nfc/scan-batch/",
             "/api/users/",
             "/admin/",
         ],
@@ -47,5 +48,6 @@ urlpatterns = [
     path("api/users/", include("nfc_users.urls")),
     path("api/patients/", include("nfc_users.patient_urls")),
     path("api/nfc/scan/", nfc_scan_view),
+    path("api/nfc/scan-batch/", nfc_scan_batch_view),
     path("", api_root),
 ]
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import Q
 from .models import UserProfile, Patient
 
 
@@ -12,4 +13,28 @@ class UserProfileAdmin(admin.ModelAdmin):
 @admin.register(Patient)
 class PatientAdmin(admin.ModelAdmin):
     list_display = ("id", "first_name", "last_name", "nfc_id", "status", "room")
-    search_fields = ("id", "first_name", "last_name", "nfc_id")
+    # Names are encrypted at rest, so only id / nfc_id are searchable.
+    search_fields = ("id", "nfc_id")
+    # Columns backing list_display (and __str__); the rest stay deferred on the list page.
+    changelist_columns = ("id", "nfc_id", "status", "_first_name", "_last_name", "_room")
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        match = getattr(request, "resolver_match", None)
+        if match is not None and match.url_name == "nfc_users_patient_changelist":
+            # Only the list page; the change form needs every column anyway.
+            qs = qs.only(*self.changelist_columns)
+        return qs
+
+    def get_search_results(self, request, queryset, search_term):
+        # Case-sensitive prefix match, written as a range so SQLite serves it from
+        # the pk and unique nfc_id indexes; icontains / istartswith compile to
+        # LIKE, which always scans the table.
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        upper = term + "\U0010ffff"
+        return (
+            queryset.filter(Q(id__gte=term, id__lt=upper) | Q(nfc_id__gte=term, nfc_id__lt=upper)),
+            False,
+        )
@@ -4,32 +4,103 @@ Uses Ark-compatible auth headers (Bearer first, then x-api-key fallback).
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import ssl
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from functools import lru_cache
-from urllib import error, request
+from operator import attrgetter
 from typing import Any
 
+import urllib3
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is the fallback
+    orjson = None
+
 
 class AiOverviewError(RuntimeError):
     pass
 
 
+class AiOverviewAuthError(AiOverviewError):
+    """Ark Labs rejected the credentials (401/403); another auth variant may work."""
+
+
+# Generated overviews keyed by BLAKE2b(model + prompt). The prompt carries every
+# patient field the model sees, so an edited record hashes to a new key.
+_OVERVIEW_CACHE_MAXSIZE = 512
+_OVERVIEW_CACHE_TTL_SECONDS = 15 * 60
+_overview_cache: OrderedDict[bytes, tuple[float, str]] = OrderedDict()
+_overview_cache_lock = threading.Lock()
+# Upstream calls in progress, by the same key: concurrent requests for one prompt
+# wait on the first caller's call instead of each paying for their own.
+_overview_inflight: dict[bytes, Future] = {}
+_overview_inflight_lock = threading.Lock()
+
+_BASE_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "User-Agent": "hacked-2025-ai-overview/1.0",
+}
+
+# Auth header variant that last got a response, per base URL; tried first so a
+# working key does not pay for failed Bearer/x-api-key attempts on every call.
+_working_auth_headers: dict[str, dict[str, str]] = {}
+_working_auth_lock = threading.Lock()
+
+
+# Patient attributes each reader needs, with the default used when an object
+# lacks one. attrgetter fetches the whole tuple in one call for real Patients.
+_PROMPT_FIELDS = (
+    ("first_name", ""),
+    ("last_name", ""),
+    ("date_of_birth", ""),
+    ("gender", ""),
+    ("status", ""),
+    ("admission_date", ""),
+    ("primary_diagnosis", ""),
+    ("allergies", []),
+    ("medications", []),
+    ("medical_history", []),
+)
+_FALLBACK_FIELDS = (
+    ("first_name", ""),
+    ("last_name", ""),
+    ("status", ""),
+    ("primary_diagnosis", ""),
+    ("medications", []),
+    ("medical_history", []),
+)
+_get_prompt_fields = attrgetter(*(name for name, _ in _PROMPT_FIELDS))
+_get_fallback_fields = attrgetter(*(name for name, _ in _FALLBACK_FIELDS))
+
+
+def _read_fields(patient: Any, getter: attrgetter, fields: tuple[tuple[str, Any], ...]) -> tuple:
+    try:
+        return getter(patient)
+    except AttributeError:
+        return tuple(getattr(patient, name, default) for name, default in fields)
+
+
+def _clean_text(item: Any) -> str:
+    if isinstance(item, str):
+        return item.strip()
+    if isinstance(item, dict):
+        return " ".join([t for t in map(str.strip, map(str, item.values())) if t])
+    return str(item).strip()
+
+
 def _clean_list(value: Any) -> list[str]:
     if not value:
         return []
     if isinstance(value, list):
-        out: list[str] = []
-        for item in value:
-            if isinstance(item, dict):
-                text = " ".join(str(v).strip() for v in item.values() if str(v).strip())
-            else:
-                text = str(item).strip()
-            if text:
-                out.append(text)
-        return out
+        return [t for t in map(_clean_text, value) if t]
     text = str(value).strip()
     return [text] if text else []
 
@@ -64,36 +135,105 @@ def _get_config() -> tuple[list[str], str, str]:
 
 
 @lru_cache(maxsize=1)
+def _endpoints() -> tuple[tuple[str, ...], str, str, str]:
+    # Env config is fixed for the life of a worker; resolve it (and the URL) once.
+    # A missing key raises and is not cached. Call _endpoints.cache_clear() after
+    # changing AI_OVERVIEW_* in-process.
+    api_keys, base_url, model = _get_config()
+    return tuple(api_keys), base_url, model, f"{base_url}/chat/completions"
+
+
+@lru_cache(maxsize=4)
+def _base_auth_variants(api_keys: tuple[str, ...]) -> tuple[dict[str, str], ...]:
+    # Shared across calls: callers copy these into fresh header dicts, never mutate.
+    variants: list[dict[str, str]] = []
+    for api_key in api_keys:
+        variants.append({"Authorization": f"Bearer {api_key}"})
+        variants.append({"x-api-key": api_key})
+    return tuple(variants)
+
+
+def _auth_header_variants(api_keys: list[str], base_url: str) -> list[dict[str, str]]:
+    variants = list(_base_auth_variants(tuple(api_keys)))
+    working = _working_auth_headers.get(base_url)
+    if working is not None and working in variants:
+        variants.remove(working)
+        variants.insert(0, working)
+    return variants
+
+
+def _remember_working_auth(base_url: str, auth_headers: dict[str, str]) -> None:
+    with _working_auth_lock:
+        _working_auth_headers[base_url] = auth_headers
+
+
+@lru_cache(maxsize=8)
+def _ssl_context_for(cafile: str | None) -> ssl.SSLContext:
+    # load_verify_locations on a full CA bundle is the expensive part; do it once
+    # per bundle path. The context is shared by every caller: do not mutate it.
+    return ssl.create_default_context(cafile=cafile)
+
+
 def _ssl_context() -> ssl.SSLContext:
     custom_bundle = (os.getenv("AI_OVERVIEW_CA_BUNDLE") or "").strip()
     if custom_bundle:
-        return ssl.create_default_context(cafile=custom_bundle)
+        return _ssl_context_for(custom_bundle)
     try:
         import certifi
 
-        return ssl.create_default_context(cafile=certifi.where())
+        return _ssl_context_for(certifi.where())
     except Exception:
-        return ssl.create_default_context()
+        return _ssl_context_for(None)
+
 
+# An unreachable host fails in seconds; only the model's generation gets the long read budget.
+_REQUEST_TIMEOUT = urllib3.Timeout(connect=5, read=45)
 
-def _post_json(url: str, payload: dict[str, Any], headers: dict[str, str]) -> dict[str, Any]:
-    body = json.dumps(payload, ensure_ascii=True).encode("utf-8")
-    req = request.Request(url=url, method="POST", data=body, headers=headers)
+
+@lru_cache(maxsize=1)
+def _http_pool() -> urllib3.PoolManager:
+    # One pool per process: keep-alive sockets are reused across overview calls,
+    # so only the first request to Ark Labs pays DNS + TCP + TLS setup.
+    return urllib3.PoolManager(num_pools=4, maxsize=16, ssl_context=_ssl_context())
+
+
+def _encode_json(payload: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _decode_json(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _post_json(url: str, body: bytes, headers: dict[str, str]) -> dict[str, Any]:
     try:
-        with request.urlopen(req, timeout=45, context=_ssl_context()) as response:
-            raw = response.read().decode("utf-8", errors="replace")
-    except error.HTTPError as exc:
-        raw = exc.read().decode("utf-8", errors="replace")
-        detail = raw.strip().replace("\n", " ")[:400]
-        raise AiOverviewError(
-            f"Ark Labs API error ({exc.code}) at {url}: {detail or 'no response body'}"
-        ) from exc
+        response = _http_pool().request(
+            "POST",
+            url,
+            body=body,
+            headers=headers,
+            timeout=_REQUEST_TIMEOUT,
+            retries=False,
+        )
     except Exception as exc:
         raise AiOverviewError(f"Ark Labs request failed at {url}: {exc}") from exc
 
+    # Parse the body bytes as-is; only the error path needs a decoded str.
+    raw = response.data
+    if response.status >= 400:
+        detail = raw[:1600].decode("utf-8", errors="replace").strip().replace("\n", " ")[:400]
+        error_cls = AiOverviewAuthError if response.status in (401, 403) else AiOverviewError
+        raise error_cls(
+            f"Ark Labs API error ({response.status}) at {url}: {detail or 'no response body'}"
+        )
+
     try:
-        parsed = json.loads(raw)
-    except json.JSONDecodeError as exc:
+        parsed = _decode_json(raw)
+    except ValueError as exc:
         raise AiOverviewError(f"Ark Labs API returned invalid JSON at {url}.") from exc
     if not isinstance(parsed, dict):
         raise AiOverviewError(f"Ark Labs API returned unexpected payload at {url}.")
@@ -123,51 +263,86 @@ def _extract_chat_content(payload: dict[str, Any]) -> str:
 
 
 def _build_prompt(patient: Any, prediction: Any | None) -> str:
+    # Read each attribute once; on Patient these properties decrypt on access.
+    (
+        first_name, last_name, dob, gender, status, admission, diagnosis,
+        allergies, medications, history,
+    ) = _read_fields(patient, _get_prompt_fields, _PROMPT_FIELDS)
+    name = f"{first_name or ''} {last_name or ''}".strip()
+    dob = dob or ""
+    gender = gender or ""
+    status = status or ""
+    admission = admission or ""
+    diagnosis = diagnosis or ""
+    allergies = ", ".join(_clean_list(allergies))
+    medications = ", ".join(_clean_list(medications))
+    history = ", ".join(_clean_list(history))
+    risk = ""
+    if prediction is not None:
+        prob = getattr(prediction, "risk_probability", None)
+        band = getattr(prediction, "risk_band", None)
+        if prob is not None and band is not None:
+            risk = f"{band} ({float(prob) * 100:.1f}%)"
+
     lines: list[str] = []
-    name = f"{getattr(patient, 'first_name', '') or ''} {getattr(patient, 'last_name', '') or ''}".strip()
     if name:
         lines.append(f"Patient: {name}")
-    dob = getattr(patient, "date_of_birth", "") or ""
-    gender = getattr(patient, "gender", "") or ""
     if dob or gender:
         lines.append(f"DOB: {dob}  Gender: {gender}")
-    status = getattr(patient, "status", "") or ""
-    admission = getattr(patient, "admission_date", "") or ""
     if status or admission:
         lines.append(f"Status: {status}  Admission: {admission}")
-
-    diagnosis = getattr(patient, "primary_diagnosis", "") or ""
     if diagnosis:
         lines.append(f"Primary diagnosis: {diagnosis}")
-    allergies = _clean_list(getattr(patient, "allergies", []))
     if allergies:
-        lines.append(f"Allergies: {', '.join(allergies)}")
-    medications = _clean_list(getattr(patient, "medications", []))
+        lines.append(f"Allergies: {allergies}")
     if medications:
-        lines.append(f"Medications: {', '.join(medications)}")
-    history = _clean_list(getattr(patient, "medical_history", []))
+        lines.append(f"Medications: {medications}")
     if history:
-        lines.append(f"Medical history: {', '.join(history)}")
-
-    if prediction is not None:
-        prob = getattr(prediction, "risk_probability", None)
-        band = getattr(prediction, "risk_band", None)
-        if prob is not None and band is not None:
-            lines.append(f"Deterioration risk: {band} ({float(prob) * 100:.1f}%)")
+        lines.append(f"Medical history: {history}")
+    if risk:
+        lines.append(f"Deterioration risk: {risk}")
     return "\n".join(lines)
 
 
+def _overview_cache_key(model: str, prompt: str) -> bytes:
+    return hashlib.blake2b(f"{model}\n{prompt}".encode("utf-8"), digest_size=16).digest()
+
+
+def _overview_cache_get(key: bytes) -> str | None:
+    with _overview_cache_lock:
+        entry = _overview_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, text = entry
+        if time.monotonic() - stored_at > _OVERVIEW_CACHE_TTL_SECONDS:
+            del _overview_cache[key]
+            return None
+        _overview_cache.move_to_end(key)
+        return text
+
+
+def _overview_cache_put(key: bytes, text: str) -> None:
+    with _overview_cache_lock:
+        _overview_cache[key] = (time.monotonic(), text)
+        _overview_cache.move_to_end(key)
+        while len(_overview_cache) > _OVERVIEW_CACHE_MAXSIZE:
+            _overview_cache.popitem(last=False)
+
+
 def build_fallback_overview(patient: Any, prediction: Any | None = None) -> str:
-    first_name = str(getattr(patient, "first_name", "") or "").strip()
-    last_name = str(getattr(patient, "last_name", "") or "").strip()
+    first_name, last_name, status, diagnosis, meds, history = _read_fields(
+        patient, _get_fallback_fields, _FALLBACK_FIELDS
+    )
+    first_name = str(first_name or "").strip()
+    last_name = str(last_name or "").strip()
     full_name = f"{first_name} {last_name}".strip() or "Patient"
 
-    status = str(getattr(patient, "status", "") or "active").strip().lower() or "active"
-    diagnosis = str(getattr(patient, "primary_diagnosis", "") or "").strip()
+    status = str(status or "active").strip().lower() or "active"
+    diagnosis = str(diagnosis or "").strip()
     diagnosis_part = diagnosis if diagnosis else "no primary diagnosis documented"
 
-    meds = _clean_list(getattr(patient, "medications", []))
-    history = _clean_list(getattr(patient, "medical_history", []))
+    meds = _clean_list(meds)
+    history = _clean_list(history)
 
     risk_part = "Risk score unavailable."
     if prediction is not None:
@@ -184,17 +359,40 @@ def build_fallback_overview(patient: Any, prediction: Any | None = None) -> str:
 
 
 def generate_ai_overview(patient: Any, prediction: Any | None = None) -> str:
-    api_keys, base_url, model = _get_config()
-    url = f"{base_url}/chat/completions"
-    base_headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "User-Agent": "hacked-2025-ai-overview/1.0",
-    }
-    auth_header_variants: list[dict[str, str]] = []
-    for api_key in api_keys:
-        auth_header_variants.append({"Authorization": f"Bearer {api_key}"})
-        auth_header_variants.append({"x-api-key": api_key})
+    api_keys, base_url, model, url = _endpoints()
+    prompt = _build_prompt(patient, prediction)
+    cache_key = _overview_cache_key(model, prompt)
+    cached = _overview_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    with _overview_inflight_lock:
+        future = _overview_inflight.get(cache_key)
+        leader = future is None
+        if leader:
+            future = _overview_inflight[cache_key] = Future()
+    if not leader:
+        return future.result()
+
+    try:
+        # A call that finished between the cache check and taking the lock cached its text.
+        text = _overview_cache_get(cache_key)
+        if text is None:
+            text = _request_overview(api_keys, base_url, model, url, prompt)
+            _overview_cache_put(cache_key, text)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(text)
+        return text
+    finally:
+        with _overview_inflight_lock:
+            del _overview_inflight[cache_key]
+
+
+def _request_overview(api_keys: tuple[str, ...], base_url: str, model: str, url: str, prompt: str) -> str:
+    auth_header_variants = _auth_header_variants(api_keys, base_url)
 
     messages = [
         {
@@ -206,24 +404,24 @@ def generate_ai_overview(patient: Any, prediction: Any | None = None) -> str:
         },
         {
             "role": "user",
-            "content": f"Patient record:\n{_build_prompt(patient, prediction)}",
+            "content": f"Patient record:\n{prompt}",
         },
     ]
 
+    # Serialize once; the same bytes are reused across auth variants and retries.
+    body = _encode_json({"model": model, "messages": messages})
+    content_length = str(len(body))
+
+    # Only a 401/403 moves on to the next auth variant; any other failure would
+    # fail the same way with different credentials, so it ends the call.
     last_error = "unknown error"
     for auth_headers in auth_header_variants:
-        headers = {**base_headers, **auth_headers}
+        headers = {**_BASE_HEADERS, **auth_headers, "Content-Length": content_length}
         for attempt in range(2):
             try:
-                payload = {
-                    "model": model,
-                    "messages": messages,
-                }
-                response_payload = _post_json(url, payload, headers)
-                text = _extract_chat_content(response_payload)
-                if text:
-                    return text
-                last_error = f"empty content for model '{model}'"
+                response_payload = _post_json(url, body, headers)
+            except AiOverviewAuthError as exc:
+                last_error = str(exc)
                 break
             except AiOverviewError as exc:
                 last_error = str(exc)
@@ -231,6 +429,19 @@ def generate_ai_overview(patient: Any, prediction: Any | None = None) -> str:
                 if retryable and attempt == 0:
                     time.sleep(0.4)
                     continue
-                break
+                raise AiOverviewError(f"AI overview API call failed: {last_error}") from exc
+            _remember_working_auth(base_url, auth_headers)
+            text = _extract_chat_content(response_payload)
+            if text:
+                return text
+            raise AiOverviewError(f"AI overview API call failed: empty content for model '{model}'")
 
     raise AiOverviewError(f"AI overview API call failed: {last_error}")
+
+
+# Load the CA bundle at import so pre-forked workers inherit it instead of each
+# paying for it on their first overview; a bad bundle path surfaces per request.
+try:
+    _ssl_context()
+except Exception:
+    pass
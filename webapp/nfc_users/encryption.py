@@ -2,7 +2,8 @@
 Field-level encryption for sensitive data at rest.
 
 - AES-256-GCM (authenticated encryption) is used for Patient and new data.
-  Key: 32-byte SHA-256(SECRET_KEY). Stored format: base64(nonce || tag || ciphertext).
+  Key: 32-byte SHA-256(SECRET_KEY). Stored format: raw bytes nonce || ciphertext || tag
+  in BinaryField columns; *_b64 helpers keep the older base64 text form.
 - Fernet (AES-128-CBC + HMAC-SHA256) remains for UserProfile backward compatibility.
 Key material is derived from Django SECRET_KEY; do not commit production SECRET_KEY.
 """
@@ -10,66 +11,146 @@ import base64
 import hashlib
 import json
 import os
+from functools import lru_cache
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from django.conf import settings
 
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is the fallback
+    orjson = None
+
+
+def _json_loads(raw: str):
+    """Parse JSON with orjson when installed (much faster decode), else stdlib."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_dumps(data) -> bytes:
+    """UTF-8 JSON bytes; orjson when installed, stdlib for anything it rejects."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # e.g. ints beyond 64 bits
+            pass
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
 # ---- AES-256-GCM (industry-standard AEAD for Patient and new data) ----
 
+@lru_cache(maxsize=1)
 def _get_aes256_key() -> bytes:
-    """Derive a 256-bit key from SECRET_KEY."""
+    """Derive a 256-bit key from SECRET_KEY (once per process)."""
     key = settings.SECRET_KEY.encode("utf-8")
     return hashlib.sha256(key).digest()
 
 
-def encrypt_value(plain: str) -> str:
-    """Encrypt a string with AES-256-GCM. Returns base64(nonce || ciphertext_with_tag)."""
+@lru_cache(maxsize=1)
+def _aesgcm() -> AESGCM:
+    """Shared AESGCM instance; encrypt/decrypt are reentrant, so threads can share it."""
+    return AESGCM(_get_aes256_key())
+
+
+def encrypt_value(plain: str) -> bytes:
+    """Encrypt a string with AES-256-GCM. Returns raw nonce || ciphertext_with_tag."""
     if not plain:
-        return ""
-    key = _get_aes256_key()
-    aesgcm = AESGCM(key)
+        return b""
+    return _encrypt_bytes(plain.encode("utf-8"))
+
+
+def _encrypt_bytes(data: bytes) -> bytes:
     nonce = os.urandom(12)
-    ct = aesgcm.encrypt(nonce, plain.encode("utf-8"), None)
-    return base64.urlsafe_b64encode(nonce + ct).decode("ascii")
+    return nonce + _aesgcm().encrypt(nonce, data, None)
 
 
-def decrypt_value(cipher: str) -> str:
-    """Decrypt a string encrypted with encrypt_value (AES-256-GCM)."""
+def decrypt_value(cipher: bytes | memoryview | str) -> str:
+    """
+    Decrypt a value produced by encrypt_value (AES-256-GCM).
+    A str is treated as the legacy base64 form from encrypt_value_b64.
+    """
     if not cipher:
         return ""
-    key = _get_aes256_key()
-    aesgcm = AESGCM(key)
-    raw = base64.urlsafe_b64decode(cipher.encode("ascii"))
-    nonce, ct_and_tag = raw[:12], raw[12:]
-    return aesgcm.decrypt(nonce, ct_and_tag, None).decode("utf-8")
+    if isinstance(cipher, str):
+        cipher = base64.urlsafe_b64decode(cipher.encode("ascii"))
+    raw = memoryview(cipher)
+    return _aesgcm().decrypt(raw[:12], raw[12:], None).decode("utf-8")
+
+
+def encrypt_value_b64(plain: str) -> str:
+    """encrypt_value as base64 text, for places that must carry ciphertext as a string."""
+    if not plain:
+        return ""
+    return base64.urlsafe_b64encode(encrypt_value(plain)).decode("ascii")
 
 
-def encrypt_json(data: dict | list) -> str:
-    """Encrypt a dict or list as JSON with AES-256-GCM."""
+def decrypt_value_b64(cipher: str) -> str:
+    """Decrypt base64 text produced by encrypt_value_b64."""
+    return decrypt_value(cipher)
+
+
+def encrypt_json(data: dict | list) -> bytes:
+    """Encrypt a dict or list as JSON with AES-256-GCM. Empty data is stored as b"" (no ciphertext)."""
+    if not data:
+        return b""
+    return _encrypt_bytes(_json_dumps(data))
+
+
+def encrypt_json_b64(data: dict | list) -> str:
+    """encrypt_json as base64 text (see encrypt_value_b64)."""
     if not data:
-        return encrypt_value("{}")
-    return encrypt_value(json.dumps(data, ensure_ascii=False))
+        return ""
+    return base64.urlsafe_b64encode(encrypt_json(data)).decode("ascii")
 
 
-def decrypt_json(cipher: str) -> dict | list:
+def decrypt_json(cipher: bytes | memoryview | str) -> dict | list:
     """Decrypt and parse JSON (dict or list)."""
     if not cipher:
-        return {} if isinstance(cipher, str) else []
-    plain = decrypt_value(cipher)
-    if not plain or plain == "{}":
+        return {} if isinstance(cipher, (str, bytes, memoryview)) else []
+    return parse_json_plain(decrypt_value(cipher))
+
+
+def parse_json_plain(plain: str) -> dict | list:
+    """Parse already-decrypted JSON text the way decrypt_json does; non-containers become {}."""
+    if not plain:
         return {}
     try:
-        out = json.loads(plain)
+        out = _json_loads(plain)
         return out if isinstance(out, (dict, list)) else {}
     except json.JSONDecodeError:
         return {}
 
 
+def decrypt_json_many(ciphers: list[bytes | memoryview | str]) -> list[dict | list]:
+    """
+    Decrypt several JSON ciphertexts and parse them with one JSON call.
+    Same per-item result as decrypt_json; falls back to item-by-item parsing
+    if any plaintext is malformed.
+    """
+    plains = [decrypt_value(c) if c else "" for c in ciphers]
+    normalized = [p if p else "{}" for p in plains]
+    try:
+        parsed = _json_loads("[" + ",".join(normalized) + "]")
+    except json.JSONDecodeError:
+        parsed = None
+    if not isinstance(parsed, list) or len(parsed) != len(normalized):
+        parsed = []
+        for plain in normalized:
+            try:
+                parsed.append(_json_loads(plain))
+            except json.JSONDecodeError:
+                parsed.append({})
+    return [out if isinstance(out, (dict, list)) else {} for out in parsed]
+
+
 # ---- Fernet (for UserProfile backward compatibility) ----
 
+@lru_cache(maxsize=1)
 def get_fernet():
-    """Build a Fernet instance from Django SECRET_KEY (UserProfile only)."""
+    """Fernet instance from Django SECRET_KEY (UserProfile only), built once per process."""
     key = settings.SECRET_KEY.encode("utf-8")
     digest = hashlib.sha256(key).digest()
     b64 = base64.urlsafe_b64encode(digest[:32])
@@ -84,6 +165,12 @@ def decrypt_value_fernet(cipher: str) -> str:
     return f.decrypt(cipher.encode("ascii")).decode("utf-8")
 
 
+def decrypt_many_fernet(ciphers: list[str]) -> list[str]:
+    """decrypt_value_fernet over a batch, resolving the Fernet object and method once."""
+    decrypt = get_fernet().decrypt
+    return [decrypt(c.encode("ascii")).decode("utf-8") if c else "" for c in ciphers]
+
+
 def encrypt_value_fernet(plain: str) -> str:
     """Encrypt with Fernet (UserProfile legacy)."""
     if not plain:
@@ -3,51 +3,57 @@
 from django.db import migrations
 
 
+DEMO_PATIENT_ID = "PROD-USER-001"
+
+# Seed row is constant; build it once at import rather than on every call.
+_DEMO_PATIENT = {
+    "id": DEMO_PATIENT_ID,
+    "first_name": "Avery",
+    "last_name": "Brooks",
+    "date_of_birth": "1992-04-14",
+    "gender": "Female",
+    "blood_type": "O+",
+    "nfc_id": DEMO_PATIENT_ID,
+    "status": "active",
+    "room": "ICU-204",
+    "admission_date": "2026-02-10",
+    "allergies": ["Penicillin"],
+    "primary_diagnosis": "Acute Myocardial Infarction",
+    "insurance_provider": "BlueCross BlueShield",
+    "insurance_id": "BCB-449281",
+    "emergency_contact": {
+        "name": "Jordan Brooks",
+        "relationship": "Spouse",
+        "phone": "(555) 123-4567",
+    },
+    "medications": [
+        {"name": "Aspirin", "dosage": "81mg", "frequency": "Daily"},
+        {"name": "Metoprolol", "dosage": "50mg", "frequency": "Twice daily"},
+    ],
+    "vital_signs": {
+        "heartRate": 78,
+        "bloodPressure": "128/82",
+        "temperature": 98.6,
+        "oxygenSaturation": 97,
+    },
+    "medical_history": [
+        "Hypertension (diagnosed 2018)",
+        "Type 2 Diabetes (diagnosed 2020)",
+    ],
+    "notes": ["Demo patient for NFC scan"],
+}
+
+
 def create_demo_patient(apps, schema_editor):
     Patient = apps.get_model("nfc_users", "Patient")
-    if Patient.objects.filter(nfc_id="PROD-USER-001").exists():
+    if Patient.objects.filter(nfc_id=DEMO_PATIENT_ID).exists():
         return
-    Patient.objects.create(
-        id="PROD-USER-001",
-        first_name="Avery",
-        last_name="Brooks",
-        date_of_birth="1992-04-14",
-        gender="Female",
-        blood_type="O+",
-        nfc_id="PROD-USER-001",
-        status="active",
-        room="ICU-204",
-        admission_date="2026-02-10",
-        allergies=["Penicillin"],
-        primary_diagnosis="Acute Myocardial Infarction",
-        insurance_provider="BlueCross BlueShield",
-        insurance_id="BCB-449281",
-        emergency_contact={
-            "name": "Jordan Brooks",
-            "relationship": "Spouse",
-            "phone": "(555) 123-4567",
-        },
-        medications=[
-            {"name": "Aspirin", "dosage": "81mg", "frequency": "Daily"},
-            {"name": "Metoprolol", "dosage": "50mg", "frequency": "Twice daily"},
-        ],
-        vital_signs={
-            "heartRate": 78,
-            "bloodPressure": "128/82",
-            "temperature": 98.6,
-            "oxygenSaturation": 97,
-        },
-        medical_history=[
-            "Hypertension (diagnosed 2018)",
-            "Type 2 Diabetes (diagnosed 2020)",
-        ],
-        notes=["Demo patient for NFC scan"],
-    )
+    Patient.objects.create(**_DEMO_PATIENT)
 
 
 def reverse(apps, schema_editor):
     Patient = apps.get_model("nfc_users", "Patient")
-    Patient.objects.filter(id="PROD-USER-001").delete()
+    Patient.objects.filter(id=DEMO_PATIENT_ID).delete()
 
 
 class Migration(migrations.Migration):
@@ -4,57 +4,69 @@ import json
 from django.db import migrations, models
 
 
+_PLAIN_COLUMNS = [
+    "first_name", "last_name", "date_of_birth", "gender", "blood_type", "room",
+    "admission_date", "primary_diagnosis", "insurance_provider", "insurance_id",
+    "alberta_health_card_number", "emergency_contact", "allergies", "medications",
+    "current_prescriptions", "medical_history", "past_medical_history", "notes",
+]
+_JSON_LIST_COLUMNS = (
+    "allergies", "medications", "current_prescriptions", "medical_history",
+    "past_medical_history", "notes",
+)
+# Column set is fixed, so build both statements once and reuse the same string
+# objects for every row (sqlite's statement cache keys on the SQL text).
+_SELECT_SQL = "SELECT id, " + ", ".join(_PLAIN_COLUMNS) + " FROM nfc_users_patient"
+# Keyset pagination on the primary key: each batch is read, encrypted and
+# written before the next, so memory stays O(batch) rather than O(table).
+_SELECT_BATCH_SQL = _SELECT_SQL + " WHERE id > %s ORDER BY id LIMIT %s"
+_BATCH_SIZE = 2000
+_UPDATE_SQL = (
+    "UPDATE nfc_users_patient SET "
+    + ", ".join(f"_{col} = %s" for col in _PLAIN_COLUMNS)
+    + " WHERE id = %s"
+)
+
+
+def _encrypt_row(row, encrypt_value, encrypt_json):
+    params = []
+    for i, col in enumerate(_PLAIN_COLUMNS):
+        val = row[i + 1]
+        if isinstance(val, str) and (col == "emergency_contact" or col in _JSON_LIST_COLUMNS):
+            try:
+                val = json.loads(val) if val.strip() else ({} if col == "emergency_contact" else [])
+            except (json.JSONDecodeError, AttributeError):
+                val = {} if col == "emergency_contact" else []
+        if col == "emergency_contact":
+            enc = encrypt_json(val if isinstance(val, dict) else {}) if val else ""
+        elif col in _JSON_LIST_COLUMNS:
+            enc = encrypt_json(val if isinstance(val, list) else []) if val else ""
+        else:
+            enc = encrypt_value(str(val)) if val else ""
+        params.append(enc)
+    params.append(row[0])
+    return params
+
+
 def encrypt_patient_data(apps, schema_editor):
     """Copy plain columns to encrypted _ columns then leave plain columns for RemoveField."""
-    Patient = apps.get_model("nfc_users", "Patient")
-    from nfc_users.encryption import encrypt_value, encrypt_json
+    # The columns are still text here; 0011 converts them to raw bytes.
+    from nfc_users.encryption import encrypt_value_b64, encrypt_json_b64
     from django.db import connection
 
     with connection.cursor() as cursor:
-        cursor.execute(
-            "SELECT id, first_name, last_name, date_of_birth, gender, blood_type, room, "
-            "admission_date, primary_diagnosis, insurance_provider, insurance_id, "
-            "alberta_health_card_number, emergency_contact, allergies, medications, "
-            "current_prescriptions, medical_history, past_medical_history, notes "
-            "FROM nfc_users_patient"
-        )
-        rows = cursor.fetchall()
-    cols = [
-        "first_name", "last_name", "date_of_birth", "gender", "blood_type", "room",
-        "admission_date", "primary_diagnosis", "insurance_provider", "insurance_id",
-        "alberta_health_card_number", "emergency_contact", "allergies", "medications",
-        "current_prescriptions", "medical_history", "past_medical_history", "notes",
-    ]
-    for row in rows:
-        patient_id = row[0]
-        updates = []
-        params = []
-        for i, col in enumerate(cols):
-            val = row[i + 1]
-            if val is None:
-                val = None
-            elif isinstance(val, str) and col in (
-                "emergency_contact", "allergies", "medications", "current_prescriptions",
-                "medical_history", "past_medical_history", "notes",
-            ):
-                try:
-                    val = json.loads(val) if val.strip() else ({} if col == "emergency_contact" else [])
-                except (json.JSONDecodeError, AttributeError):
-                    val = {} if col == "emergency_contact" else []
-            if col == "emergency_contact":
-                enc = encrypt_json(val if isinstance(val, dict) else {}) if val else ""
-            elif col in ("allergies", "medications", "current_prescriptions", "medical_history", "past_medical_history", "notes"):
-                enc = encrypt_json(val if isinstance(val, list) else []) if val else ""
-            else:
-                enc = encrypt_value(str(val)) if val else ""
-            updates.append(f"_{col} = %s")
-            params.append(enc)
-        params.append(patient_id)
-        with connection.cursor() as c:
-            c.execute(
-                "UPDATE nfc_users_patient SET " + ", ".join(updates) + " WHERE id = %s",
-                params,
+        last_id = ""
+        while True:
+            cursor.execute(_SELECT_BATCH_SQL, [last_id, _BATCH_SIZE])
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            # Column order is fixed, so every row maps onto the same
+            # statement: one executemany per batch instead of N executes.
+            cursor.executemany(
+                _UPDATE_SQL, [_encrypt_row(row, encrypt_value_b64, encrypt_json_b64) for row in rows]
             )
+            last_id = rows[-1][0]
 
 
 class Migration(migrations.Migration):
@@ -0,0 +1,198 @@
+# Store encrypted Patient columns as raw bytes instead of base64 text
+
+import base64
+from django.db import migrations, models
+
+
+_ENCRYPTED_COLUMNS = [
+    "first_name", "last_name", "date_of_birth", "gender", "blood_type", "room",
+    "admission_date", "primary_diagnosis", "insurance_provider", "insurance_id",
+    "alberta_health_card_number", "emergency_contact", "allergies", "medications",
+    "current_prescriptions", "medical_history", "past_medical_history",
+    "important_test_results", "notes", "historical_blood_pressure",
+    "historical_heart_rate", "historical_body_weight", "family_history",
+]
+# Keyset pagination on the primary key, as in 0006: each batch is read,
+# converted and written before the next, so memory stays O(batch).
+_SELECT_BATCH_SQL = (
+    "SELECT id, " + ", ".join(f"_{col}" for col in _ENCRYPTED_COLUMNS)
+    + " FROM nfc_users_patient WHERE id > %s ORDER BY id LIMIT %s"
+)
+_BATCH_SIZE = 2000
+_UPDATE_SQL = (
+    "UPDATE nfc_users_patient SET "
+    + ", ".join(f"_{col} = %s" for col in _ENCRYPTED_COLUMNS)
+    + " WHERE id = %s"
+)
+
+
+def _rewrite_rows(schema_editor, convert):
+    with schema_editor.connection.cursor() as cursor:
+        last_id = ""
+        while True:
+            cursor.execute(_SELECT_BATCH_SQL, [last_id, _BATCH_SIZE])
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            cursor.executemany(_UPDATE_SQL, [[convert(value) for value in row[1:]] + [row[0]] for row in rows])
+            last_id = rows[-1][0]
+
+
+def _b64_to_bytes(value):
+    # Existing values are base64 text; depending on the backend the column cast
+    # hands them back as str or as the ASCII bytes of that text.
+    if not value:
+        return b""
+    if not isinstance(value, str):
+        value = bytes(value)
+    return base64.urlsafe_b64decode(value)
+
+
+def _bytes_to_b64(value):
+    # Runs after the reverse AlterField, so the column is text again but still
+    # holds the raw ciphertext in whatever form the cast left it: sqlite keeps
+    # the blob as-is, Postgres renders bytea::text as '\x<hex>'.
+    if not value:
+        return ""
+    if isinstance(value, str):
+        if not value.startswith("\\x"):
+            return value
+        value = bytes.fromhex(value[2:])
+    return base64.urlsafe_b64encode(bytes(value)).decode("ascii")
+
+
+def base64_to_raw(apps, schema_editor):
+    _rewrite_rows(schema_editor, _b64_to_bytes)
+
+
+def raw_to_base64(apps, schema_editor):
+    _rewrite_rows(schema_editor, _bytes_to_b64)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("nfc_users", "0010_patient_vitals_and_family_history"),
+    ]
+
+    operations = [
+        # Reverse only: listed first so it runs last on rollback, once the columns
+        # are text again and can take the base64 strings.
+        migrations.RunPython(migrations.RunPython.noop, raw_to_base64),
+        migrations.AlterField(
+            model_name="patient",
+            name="_first_name",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_last_name",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_date_of_birth",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_gender",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_blood_type",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_room",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_admission_date",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_primary_diagnosis",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_insurance_provider",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_insurance_id",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_alberta_health_card_number",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_emergency_contact",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_allergies",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_medications",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_current_prescriptions",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_medical_history",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_past_medical_history",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_important_test_results",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_notes",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_historical_blood_pressure",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_historical_heart_rate",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_historical_body_weight",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="_family_history",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.RunPython(base64_to_raw, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,42 @@ User profile keyed by NFC user_id. Sensitive fields stored encrypted in SQLite.
 """
 from django.db import models
 
+from .encryption import (
+    decrypt_json_many,
+    decrypt_many_fernet,
+    decrypt_value,
+    decrypt_value_fernet,
+    encrypt_json,
+    encrypt_value,
+    encrypt_value_fernet,
+    parse_json_plain,
+)
+
+
+def _cached_decrypt(instance, column, decrypt):
+    """
+    Decrypt instance.<column>, memoized on the instance. The entry is keyed on
+    the ciphertext object itself, so assigning the column (setter, refresh_from_db)
+    invalidates it without any bookkeeping.
+    """
+    cipher = getattr(instance, column, None)
+    if not cipher:
+        return ""
+    cache = instance.__dict__.setdefault("_decrypted", {})
+    hit = cache.get(column)
+    if hit is not None and hit[0] is cipher:
+        return hit[1]
+    plain = decrypt(cipher)
+    cache[column] = (cipher, plain)
+    return plain
+
+
+def _store_encrypted(instance, column, plain, encrypt):
+    cipher = encrypt(plain)
+    setattr(instance, column, cipher)
+    # The plaintext is already known; seed the cache so a read-back is free.
+    instance.__dict__.setdefault("_decrypted", {})[column] = (cipher, plain)
+
 
 class UserProfile(models.Model):
     """
@@ -29,53 +65,43 @@ class UserProfile(models.Model):
 
     @property
     def first_name(self):
-        from .encryption import decrypt_value_fernet
-        return decrypt_value_fernet(self._first_name) if self._first_name else ""
+        return _cached_decrypt(self, "_first_name", decrypt_value_fernet)
 
     @first_name.setter
     def first_name(self, value):
-        from .encryption import encrypt_value_fernet
-        self._first_name = encrypt_value_fernet((value or "").strip())
+        _store_encrypted(self, "_first_name", (value or "").strip(), encrypt_value_fernet)
 
     @property
     def last_name(self):
-        from .encryption import decrypt_value_fernet
-        return decrypt_value_fernet(self._last_name) if self._last_name else ""
+        return _cached_decrypt(self, "_last_name", decrypt_value_fernet)
 
     @last_name.setter
     def last_name(self, value):
-        from .encryption import encrypt_value_fernet
-        self._last_name = encrypt_value_fernet((value or "").strip())
+        _store_encrypted(self, "_last_name", (value or "").strip(), encrypt_value_fernet)
 
     @property
     def email(self):
-        from .encryption import decrypt_value_fernet
-        return decrypt_value_fernet(self._email) if self._email else ""
+        return _cached_decrypt(self, "_email", decrypt_value_fernet)
 
     @email.setter
     def email(self, value):
-        from .encryption import encrypt_value_fernet
-        self._email = encrypt_value_fernet((value or "").strip())
+        _store_encrypted(self, "_email", (value or "").strip(), encrypt_value_fernet)
 
     @property
     def phone(self):
-        from .encryption import decrypt_value_fernet
-        return decrypt_value_fernet(self._phone) if self._phone else ""
+        return _cached_decrypt(self, "_phone", decrypt_value_fernet)
 
     @phone.setter
     def phone(self, value):
-        from .encryption import encrypt_value_fernet
-        self._phone = encrypt_value_fernet((value or "").strip())
+        _store_encrypted(self, "_phone", (value or "").strip(), encrypt_value_fernet)
 
     @property
     def notes(self):
-        from .encryption import decrypt_value_fernet
-        return decrypt_value_fernet(self._notes) if self._notes else ""
+        return _cached_decrypt(self, "_notes", decrypt_value_fernet)
 
     @notes.setter
     def notes(self, value):
-        from .encryption import encrypt_value_fernet
-        self._notes = encrypt_value_fernet((value or "").strip())
+        _store_encrypted(self, "_notes", (value or "").strip(), encrypt_value_fernet)
 
     def set_plain_fields(self, first_name="", last_name="", email="", phone="", notes=""):
         self.first_name = first_name
@@ -96,6 +122,35 @@ class UserProfile(models.Model):
             "updatedAt": self.updated_at.isoformat() if self.updated_at else None,
         }
 
+    # values_list() columns consumed by api_dicts_from_rows.
+    API_ROW_COLUMNS = (
+        "user_id", "_first_name", "_last_name", "_email", "_phone", "_notes", "created_at", "updated_at",
+    )
+
+    @classmethod
+    def api_dicts_from_rows(cls, rows):
+        """
+        to_api_dict output for a batch of values_list(*API_ROW_COLUMNS) rows,
+        decrypting every ciphertext in the batch with one decrypt_many_fernet call.
+        createdAt/updatedAt stay datetimes for the JSON serializer to render
+        (same ISO 8601 text as to_api_dict, without a per-row isoformat call).
+        """
+        plains = decrypt_many_fernet([cipher for row in rows for cipher in row[1:6]])
+        out = []
+        for i, (user_id, _, _, _, _, _, created_at, updated_at) in enumerate(rows):
+            first_name, last_name, email, phone, notes = plains[5 * i:5 * i + 5]
+            out.append({
+                "userId": user_id,
+                "firstName": first_name,
+                "lastName": last_name,
+                "email": email,
+                "phone": phone,
+                "notes": notes,
+                "createdAt": created_at,
+                "updatedAt": updated_at,
+            })
+        return out
+
 
 class Patient(models.Model):
     """
@@ -107,53 +162,101 @@ class Patient(models.Model):
     nfc_id = models.CharField(max_length=15, unique=True, db_index=True)
     status = models.CharField(max_length=32)  # active | discharged | critical
     use_alberta_health_card = models.BooleanField(default=False)
-    # Encrypted at rest (AES-256-GCM); stored as base64 ciphertext
-    _first_name = models.TextField(blank=True, default="")
-    _last_name = models.TextField(blank=True, default="")
-    _date_of_birth = models.TextField(blank=True, default="")
-    _gender = models.TextField(blank=True, default="")
-    _blood_type = models.TextField(blank=True, default="")
-    _room = models.TextField(blank=True, default="")
-    _admission_date = models.TextField(blank=True, default="")
-    _primary_diagnosis = models.TextField(blank=True, default="")
-    _insurance_provider = models.TextField(blank=True, default="")
-    _insurance_id = models.TextField(blank=True, default="")
-    _alberta_health_card_number = models.TextField(blank=True, default="")
-    _emergency_contact = models.TextField(blank=True, default="")
-    _allergies = models.TextField(blank=True, default="")
-    _medications = models.TextField(blank=True, default="")
-    _current_prescriptions = models.TextField(blank=True, default="")
-    _medical_history = models.TextField(blank=True, default="")
-    _past_medical_history = models.TextField(blank=True, default="")
-    _important_test_results = models.TextField(blank=True, default="")
-    _notes = models.TextField(blank=True, default="")
-    _historical_blood_pressure = models.TextField(blank=True, default="")
-    _historical_heart_rate = models.TextField(blank=True, default="")
-    _historical_body_weight = models.TextField(blank=True, default="")
-    _family_history = models.TextField(blank=True, default="")
+    # Encrypted at rest (AES-256-GCM); stored as raw nonce || ciphertext bytes
+    _first_name = models.BinaryField(blank=True, default=b"")
+    _last_name = models.BinaryField(blank=True, default=b"")
+    _date_of_birth = models.BinaryField(blank=True, default=b"")
+    _gender = models.BinaryField(blank=True, default=b"")
+    _blood_type = models.BinaryField(blank=True, default=b"")
+    _room = models.BinaryField(blank=True, default=b"")
+    _admission_date = models.BinaryField(blank=True, default=b"")
+    _primary_diagnosis = models.BinaryField(blank=True, default=b"")
+    _insurance_provider = models.BinaryField(blank=True, default=b"")
+    _insurance_id = models.BinaryField(blank=True, default=b"")
+    _alberta_health_card_number = models.BinaryField(blank=True, default=b"")
+    _emergency_contact = models.BinaryField(blank=True, default=b"")
+    _allergies = models.BinaryField(blank=True, default=b"")
+    _medications = models.BinaryField(blank=True, default=b"")
+    _current_prescriptions = models.BinaryField(blank=True, default=b"")
+    _medical_history = models.BinaryField(blank=True, default=b"")
+    _past_medical_history = models.BinaryField(blank=True, default=b"")
+    _important_test_results = models.BinaryField(blank=True, default=b"")
+    _notes = models.BinaryField(blank=True, default=b"")
+    _historical_blood_pressure = models.BinaryField(blank=True, default=b"")
+    _historical_heart_rate = models.BinaryField(blank=True, default=b"")
+    _historical_body_weight = models.BinaryField(blank=True, default=b"")
+    _family_history = models.BinaryField(blank=True, default=b"")
+    # Bumped on every save; validator for the single-patient GET (ETag / Last-Modified).
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["id"]
 
+    # (property, encrypted column, container type) for every JSON-encoded field.
+    _JSON_FIELDS = (
+        ("emergency_contact", "_emergency_contact", dict),
+        ("allergies", "_allergies", list),
+        ("medications", "_medications", list),
+        ("current_prescriptions", "_current_prescriptions", list),
+        ("medical_history", "_medical_history", list),
+        ("past_medical_history", "_past_medical_history", list),
+        ("notes", "_notes", list),
+        ("historical_blood_pressure", "_historical_blood_pressure", list),
+        ("historical_heart_rate", "_historical_heart_rate", list),
+        ("historical_body_weight", "_historical_body_weight", list),
+        ("family_history", "_family_history", list),
+    )
+
+    # to_api_dict key -> column backing it; the property is the column name
+    # without the leading underscore. Lets callers asking for a subset of keys
+    # defer every other column (list endpoint ?fields=).
+    API_FIELD_COLUMNS = {
+        "id": "id",
+        "firstName": "_first_name",
+        "lastName": "_last_name",
+        "dateOfBirth": "_date_of_birth",
+        "gender": "_gender",
+        "bloodType": "_blood_type",
+        "nfcId": "nfc_id",
+        "status": "status",
+        "room": "_room",
+        "admissionDate": "_admission_date",
+        "allergies": "_allergies",
+        "primaryDiagnosis": "_primary_diagnosis",
+        "insuranceProvider": "_insurance_provider",
+        "insuranceId": "_insurance_id",
+        "useAlbertaHealthCard": "use_alberta_health_card",
+        "albertaHealthCardNumber": "_alberta_health_card_number",
+        "emergencyContact": "_emergency_contact",
+        "medications": "_medications",
+        "currentPrescriptions": "_current_prescriptions",
+        "medicalHistory": "_medical_history",
+        "pastMedicalHistory": "_past_medical_history",
+        "importantTestResults": "_important_test_results",
+        "notes": "_notes",
+        "historicalBloodPressure": "_historical_blood_pressure",
+        "historicalHeartRate": "_historical_heart_rate",
+        "historicalBodyWeight": "_historical_body_weight",
+        "familyHistory": "_family_history",
+    }
+
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.nfc_id})"
 
     # ---- Encrypted properties (AES-256-GCM) ----
     def _get_enc(self, name):
-        from .encryption import decrypt_value
-        val = getattr(self, name, None)
-        return decrypt_value(val) if val else ""
+        return _cached_decrypt(self, name, decrypt_value)
 
     def _set_enc(self, name, value):
-        from .encryption import encrypt_value
-        setattr(self, name, encrypt_value((value or "").strip()))
+        _store_encrypted(self, name, (value or "").strip(), encrypt_value)
 
     def _get_json(self, name, default=None):
-        from .encryption import decrypt_json
         val = getattr(self, name, None)
         if not val:
             return default if default is not None else {}
-        out = decrypt_json(val)
+        # The decrypted text is memoized like the string fields; parsing stays per
+        # read so every caller gets its own list/dict to mutate.
+        out = parse_json_plain(_cached_decrypt(self, name, decrypt_value))
         if out is None:
             return default if default is not None else {}
         if default is not None and type(out) is not type(default):
@@ -161,10 +264,19 @@ class Patient(models.Model):
         return out
 
     def _set_json(self, name, value):
-        from .encryption import encrypt_json
         if value is None:
             value = {} if "contact" in name else []
-        setattr(self, name, encrypt_json(value) if value else "")
+        setattr(self, name, encrypt_json(value) if value else b"")
+
+    def _get_json_fields(self):
+        """Decrypt all JSON fields of this row with a single JSON parse."""
+        present = [f for f in self._JSON_FIELDS if getattr(self, f[1], None)]
+        values = decrypt_json_many([getattr(self, column) for _, column, _ in present])
+        out = {name: kind() for name, _, kind in self._JSON_FIELDS}
+        for (name, _, kind), value in zip(present, values):
+            if type(value) is kind and value:
+                out[name] = value
+        return out
 
     @property
     def first_name(self):
@@ -350,7 +462,11 @@ class Patient(models.Model):
     def family_history(self, value):
         self._set_json("_family_history", value if isinstance(value, list) else [])
 
-    def to_api_dict(self):
+    def to_api_dict(self, fields=None):
+        """API representation; with fields (keys of API_FIELD_COLUMNS), only those keys."""
+        if fields is not None:
+            return {key: getattr(self, self.API_FIELD_COLUMNS[key].lstrip("_")) for key in fields}
+        json_fields = self._get_json_fields()
         return {
             "id": self.id,
             "firstName": self.first_name,
@@ -362,21 +478,53 @@ class Patient(models.Model):
             "status": self.status,
             "room": self.room,
             "admissionDate": self.admission_date,
-            "allergies": self.allergies or [],
+            "allergies": json_fields["allergies"],
             "primaryDiagnosis": self.primary_diagnosis,
             "insuranceProvider": self.insurance_provider or "",
             "insuranceId": self.insurance_id or "",
             "useAlbertaHealthCard": self.use_alberta_health_card,
             "albertaHealthCardNumber": self.alberta_health_card_number or "",
-            "emergencyContact": self.emergency_contact or {},
-            "medications": self.medications or [],
-            "currentPrescriptions": self.current_prescriptions or [],
-            "medicalHistory": self.medical_history or [],
-            "pastMedicalHistory": self.past_medical_history or [],
+            "emergencyContact": json_fields["emergency_contact"],
+            "medications": json_fields["medications"],
+            "currentPrescriptions": json_fields["current_prescriptions"],
+            "medicalHistory": json_fields["medical_history"],
+            "pastMedicalHistory": json_fields["past_medical_history"],
             "importantTestResults": self.important_test_results or "",
-            "notes": self.notes or [],
-            "historicalBloodPressure": self.historical_blood_pressure or [],
-            "historicalHeartRate": self.historical_heart_rate or [],
-            "historicalBodyWeight": self.historical_body_weight or [],
-            "familyHistory": self.family_history or [],
+            "notes": json_fields["notes"],
+            "historicalBloodPressure": json_fields["historical_blood_pressure"],
+            "historicalHeartRate": json_fields["historical_heart_rate"],
+            "historicalBodyWeight": json_fields["historical_body_weight"],
+            "familyHistory": json_fields["family_history"],
         }
+
+    # Encrypted JSON column -> container type it must decode to (see _JSON_FIELDS).
+    _JSON_COLUMN_KINDS = {column: kind for _, column, kind in _JSON_FIELDS}
+
+    @classmethod
+    def api_row_columns(cls, fields=None):
+        """values_list() columns consumed by api_dicts_from_rows for these keys (all by default)."""
+        keys = cls.API_FIELD_COLUMNS if fields is None else fields
+        return [cls.API_FIELD_COLUMNS[key] for key in keys]
+
+    @classmethod
+    def api_dicts_from_rows(cls, rows, fields=None):
+        """
+        to_api_dict(fields) output for a batch of values_list(*api_row_columns(fields))
+        rows, without building model instances. Every JSON column in the batch is
+        parsed with one decrypt_json_many call.
+        """
+        keys = list(cls.API_FIELD_COLUMNS if fields is None else fields)
+        columns = cls.api_row_columns(keys)
+        json_slots = [(i, cls._JSON_COLUMN_KINDS[c]) for i, c in enumerate(columns) if c in cls._JSON_COLUMN_KINDS]
+        text_slots = [i for i, c in enumerate(columns) if c.startswith("_") and c not in cls._JSON_COLUMN_KINDS]
+        parsed = iter(decrypt_json_many([row[i] for row in rows for i, _ in json_slots if row[i]]))
+        out = []
+        for row in rows:
+            values = list(row)
+            for i in text_slots:
+                values[i] = decrypt_value(values[i]) if values[i] else ""
+            for i, kind in json_slots:
+                value = next(parsed) if values[i] else None
+                values[i] = value if type(value) is kind and value else kind()
+            out.append(dict(zip(keys, values)))
+        return out
@@ -1,10 +1,17 @@
 import json
+import time
 from unittest.mock import patch
 
-from django.test import Client, TestCase
+from django.contrib.admin.sites import site as admin_site
+from django.test import Client, RequestFactory, TestCase
+from django.utils import timezone
+from django.utils.http import http_date
 
 from nfc_users.ai_overview import AiOverviewError
+from nfc_users.encryption import encrypt_value
 from nfc_users.models import Patient
+from nfc_users import views as nfc_views
+from nfc_users.views import MAX_SCAN_BATCH_TAGS
 
 
 def _create_patient(
@@ -123,3 +130,237 @@ class RiskApiFlowTests(TestCase):
         body = overview_resp.json()
         self.assertEqual(body.get("source"), "fallback")
         self.assertTrue(isinstance(body.get("overview"), str) and body.get("overview", "").strip())
+
+    def test_patient_list_fields_returns_only_requested_keys(self):
+        patient = _create_patient(
+            patient_id="FLOW-004",
+            nfc_id="FLOW-004",
+            admission_date="2026-02-10",
+            status="active",
+        )
+        client = Client()
+
+        list_resp = client.get("/api/patients/", {"fields": "id,firstName,medications"})
+        self.assertEqual(list_resp.status_code, 200)
+        rows = json.loads(b"".join(list_resp.streaming_content))
+        row = next(r for r in rows if r["id"] == patient.id)
+        self.assertEqual(row, {"id": patient.id, "firstName": "Test", "medications": ["med-a"]})
+
+        bad_resp = client.get("/api/patients/", {"fields": "id,ssn"})
+        self.assertEqual(bad_resp.status_code, 400)
+
+    def test_patient_by_id_honours_if_none_match(self):
+        patient = _create_patient(
+            patient_id="FLOW-005",
+            nfc_id="FLOW-005",
+            admission_date="2026-02-10",
+            status="active",
+        )
+        client = Client()
+
+        first = client.get(f"/api/patients/{patient.id}/")
+        self.assertEqual(first.status_code, 200)
+        etag = first["ETag"]
+
+        cached = client.get(f"/api/patients/{patient.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+
+        client.patch(
+            f"/api/patients/{patient.id}/",
+            data=json.dumps({"firstName": "Renamed"}),
+            content_type="application/json",
+        )
+        changed = client.get(f"/api/patients/{patient.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["firstName"], "Renamed")
+
+    def test_patient_by_nfc_honours_if_none_match(self):
+        _create_patient(
+            patient_id="FLOW-008",
+            nfc_id="FLOW-008-TAG",
+            admission_date="2026-02-10",
+            status="active",
+        )
+        client = Client()
+
+        first = client.get("/api/patients/by-nfc/FLOW-008-TAG/")
+        self.assertEqual(first.status_code, 200)
+        etag = first["ETag"]
+
+        cached = client.get("/api/patients/by-nfc/FLOW-008-TAG/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+
+        client.patch(
+            "/api/patients/FLOW-008/",
+            data=json.dumps({"firstName": "Renamed"}),
+            content_type="application/json",
+        )
+        changed = client.get("/api/patients/by-nfc/FLOW-008-TAG/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["firstName"], "Renamed")
+
+    def test_patient_by_id_ignores_if_modified_since(self):
+        patient = _create_patient(
+            patient_id="FLOW-007",
+            nfc_id="FLOW-007",
+            admission_date="2026-02-10",
+            status="active",
+        )
+        client = Client()
+        since = http_date(time.time() + 60)
+
+        first = client.get(f"/api/patients/{patient.id}/", HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn("Last-Modified", first)
+
+        client.patch(
+            f"/api/patients/{patient.id}/",
+            data=json.dumps({"firstName": "Renamed"}),
+            content_type="application/json",
+        )
+        changed = client.get(f"/api/patients/{patient.id}/", HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["firstName"], "Renamed")
+
+    def test_nfc_scan_sees_writes_made_without_signals(self):
+        patient = _create_patient(
+            patient_id="FLOW-006",
+            nfc_id="FLOW-006",
+            admission_date="2026-02-10",
+            status="active",
+        )
+        client = Client()
+
+        def scan():
+            resp = client.post(
+                "/api/nfc/scan/",
+                data=json.dumps({"tag_id": patient.nfc_id}),
+                content_type="application/json",
+            )
+            self.assertEqual(resp.status_code, 200)
+            return resp.json()["patient"]
+
+        self.assertEqual(scan()["firstName"], "Test")
+        # A queryset update sends no signals, like a write committed by another worker.
+        Patient.objects.filter(pk=patient.pk).update(
+            _first_name=encrypt_value("Changed"),
+            updated_at=timezone.now(),
+        )
+        self.assertEqual(scan()["firstName"], "Changed")
+
+
+    def test_nfc_cache_hands_out_copies_and_expires(self):
+        _create_patient(patient_id="FLOW-009", nfc_id="FLOW-009", admission_date="2026-02-10")
+
+        first = nfc_views._patient_dict_by_nfc("FLOW-009")
+        first["firstName"] = "Mutated"
+        first["allergies"].append("Mutated")
+        second = nfc_views._patient_dict_by_nfc("FLOW-009")
+        self.assertEqual(second["firstName"], "Test")
+        self.assertNotIn("Mutated", second["allergies"])
+        self.assertIn("FLOW-009", nfc_views._patient_nfc_cache)
+
+        nfc_views._expire_patient_nfc_cache(time.monotonic() + nfc_views._PATIENT_NFC_CACHE_TTL_SECONDS)
+        self.assertNotIn("FLOW-009", nfc_views._patient_nfc_cache)
+
+class StreamingListTests(TestCase):
+    def test_patient_list_streams_every_row_across_chunks(self):
+        for i in range(5):
+            _create_patient(patient_id=f"LIST-{i}", nfc_id=f"LIST-{i}", admission_date="2026-02-10")
+        client = Client()
+
+        with patch("nfc_users.views._STREAM_CHUNK_SIZE", 2):
+            resp = client.get("/api/patients/")
+            self.assertEqual(resp.status_code, 200)
+            rows = json.loads(b"".join(resp.streaming_content))
+        listed = [r for r in rows if r["id"].startswith("LIST-")]
+        self.assertEqual([r["id"] for r in listed], [f"LIST-{i}" for i in range(5)])
+        self.assertEqual(listed[0]["medications"], ["med-a"])
+
+    def test_user_list_streams_every_row_across_chunks(self):
+        client = Client()
+        for i in range(3):
+            created = client.post(
+                "/api/users/create/",
+                data=json.dumps({"userId": f"U-{i}", "firstName": f"User{i}"}),
+                content_type="application/json",
+            )
+            self.assertEqual(created.status_code, 201)
+
+        with patch("nfc_users.views._STREAM_CHUNK_SIZE", 2):
+            resp = client.get("/api/users/")
+            self.assertEqual(resp.status_code, 200)
+            users = json.loads(b"".join(resp.streaming_content))["users"]
+        self.assertEqual([u["userId"] for u in users], ["U-0", "U-1", "U-2"])
+        self.assertEqual(users[2]["firstName"], "User2")
+
+    def test_patient_list_fails_before_streaming_when_first_chunk_is_corrupt(self):
+        patient = _create_patient(patient_id="LIST-BAD", nfc_id="LIST-BAD", admission_date="2026-02-10")
+        Patient.objects.filter(pk=patient.pk).update(_first_name=b"\x00" * 40)
+        client = Client(raise_request_exception=False)
+
+        resp = client.get("/api/patients/")
+        self.assertEqual(resp.status_code, 500)
+        self.assertFalse(resp.streaming)
+
+
+class NfcScanBatchTests(TestCase):
+    def _scan_batch(self, body):
+        return Client().post(
+            "/api/nfc/scan-batch/",
+            data=body if isinstance(body, str) else json.dumps(body),
+            content_type="application/json",
+        )
+
+    def test_scan_batch_returns_found_and_missing_tags(self):
+        for i in range(2):
+            _create_patient(patient_id=f"BATCH-{i}", nfc_id=f"BATCH-{i}", admission_date="2026-02-10")
+
+        resp = self._scan_batch({"tag_ids": [" BATCH-1 ", "NOPE", "BATCH-0", "BATCH-1", 7, ""]})
+        self.assertEqual(resp.status_code, 200)
+        body = resp.json()
+        self.assertEqual(body["mode"], "nfc-tag-batch")
+        self.assertEqual(sorted(body["patients"]), ["BATCH-0", "BATCH-1"])
+        self.assertEqual(body["patients"]["BATCH-1"]["id"], "BATCH-1")
+        self.assertEqual(body["missing"], ["NOPE"])
+
+    def test_scan_batch_rejects_bad_bodies(self):
+        for body in ("{not json", {"tag_ids": "BATCH-0"}, {"tag_ids": []}, {"tag_ids": ["  ", 3]}, {}):
+            with self.subTest(body=body):
+                self.assertEqual(self._scan_batch(body).status_code, 400)
+
+    def test_scan_batch_rejects_non_object_json(self):
+        for body in ("[]", '"x"', "1", "null"):
+            with self.subTest(body=body):
+                resp = self._scan_batch(body)
+                self.assertEqual(resp.status_code, 400)
+                self.assertEqual(resp.json()["detail"], "Body must be a JSON object.")
+
+    def test_scan_batch_enforces_tag_limit(self):
+        tags = [f"T{i}" for i in range(MAX_SCAN_BATCH_TAGS)]
+        at_limit = self._scan_batch({"tag_ids": tags})
+        self.assertEqual(at_limit.status_code, 200)
+        self.assertEqual(len(at_limit.json()["missing"]), MAX_SCAN_BATCH_TAGS)
+
+        over_limit = self._scan_batch({"tag_ids": tags + ["T-extra"]})
+        self.assertEqual(over_limit.status_code, 400)
+
+
+class PatientAdminSearchTests(TestCase):
+    def test_search_is_a_case_sensitive_id_or_nfc_prefix(self):
+        _create_patient(patient_id="ADM-100", nfc_id="TAG-9", admission_date="2026-02-10")
+        _create_patient(patient_id="ADM-200", nfc_id="TAG-1", admission_date="2026-02-10")
+        model_admin = admin_site._registry[Patient]
+        request = RequestFactory().get("/admin/nfc_users/patient/")
+
+        def search(term):
+            qs, may_have_duplicates = model_admin.get_search_results(request, Patient.objects.all(), term)
+            self.assertFalse(may_have_duplicates)
+            return sorted(qs.values_list("id", flat=True))
+
+        self.assertEqual(search("ADM-1"), ["ADM-100"])
+        self.assertEqual(search(" TAG-1 "), ["ADM-200"])
+        self.assertEqual(search("TAG"), ["ADM-100", "ADM-200"])
+        self.assertEqual(search("adm"), [])
+        self.assertEqual(search("100"), [])
+        self.assertEqual(search(""), sorted(Patient.objects.values_list("id", flat=True)))
@@ -1,19 +1,212 @@
 """
 REST API for NFC user lookup, create, and Patient API for React frontend.
 """
+import asyncio
+import datetime
+import hashlib
 import json
-from django.http import JsonResponse
+import threading
+import time
+from functools import lru_cache
+from itertools import chain, islice
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_POST, require_http_methods
 
 from .ai_overview import AiOverviewError, build_fallback_overview, generate_ai_overview
 from .models import UserProfile, Patient
 
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is the fallback
+    orjson = None
+
+
+class _JSONEncoder(DjangoJSONEncoder):
+    # Full isoformat() for datetimes, matching orjson (DjangoJSONEncoder trims to ms).
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _json_dumps(data) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # types orjson rejects fall through to the stdlib encoder
+            pass
+    return json.dumps(data, cls=_JSONEncoder).encode("utf-8")
+
+
+def _json_loads(raw: bytes):
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers' except clauses still apply.
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_response(data, status=200):
+    """JsonResponse equivalent that serializes with orjson when installed."""
+    return _json_bytes_response(_json_dumps(data), status)
+
+
+def _json_bytes_response(body, status):
+    response = HttpResponse(body, status=status, content_type="application/json")
+    # Length is known here; CommonMiddleware would otherwise measure the content again.
+    response["Content-Length"] = str(len(body))
+    return response
+
+
+def _conditional_json_response(request, pk, updated_at, build, variant=""):
+    """
+    Single-row GET validated by (pk, updated_at). A client whose If-None-Match
+    still matches gets a 304 without build() decrypting the row. variant
+    distinguishes representations of one row (e.g. a ?fields= projection).
+
+    Only an ETag is sent: HTTP dates have whole-second resolution, so a
+    Last-Modified / If-Modified-Since pair would 304 a second edit made within
+    the same second as the one the client last saw.
+    """
+    validator = f"{pk}\n{updated_at.isoformat()}\n{variant}"
+    etag = quote_etag(hashlib.blake2b(validator.encode("utf-8"), digest_size=16).hexdigest())
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = _json_response(build())
+    response["ETag"] = etag
+    return response
+
+
+@lru_cache(maxsize=32)
+def _detail_body(detail):
+    return _json_dumps({"detail": detail})
+
+
+def _detail_response(detail, status):
+    """{"detail": ...} reply for a fixed message (not interpolated); its body is encoded once."""
+    return _json_bytes_response(_detail_body(detail), status)
+
+
+# Per-process cache of nfc_id -> (pk, updated_at, stored_at, encoded to_api_dict()).
+# Every scan still reads the row with one indexed query; it is only decrypted again
+# when its pk or updated_at differ from the cached entry, so a committed write from
+# any worker (or a tag moved to another patient) is seen on the very next scan.
+#
+# Entries are decrypted PHI held in process memory, which the encrypted columns
+# otherwise avoid. That is accepted for scan latency but bounded: at most
+# _PATIENT_NFC_CACHE_MAXSIZE patients, each dropped _PATIENT_NFC_CACHE_TTL_SECONDS
+# after it was stored (swept on the next lookup), and evicted on a missing tag.
+_PATIENT_NFC_CACHE_MAXSIZE = 1024
+_PATIENT_NFC_CACHE_TTL_SECONDS = 300
+_patient_nfc_cache: dict[str, tuple[str, datetime.datetime, float, bytes]] = {}
+_patient_nfc_cache_lock = threading.Lock()
+
+
+def _expire_patient_nfc_cache(now):
+    # Entries are (re)inserted at the end, so the oldest are always first.
+    while _patient_nfc_cache:
+        oldest = next(iter(_patient_nfc_cache))
+        if now - _patient_nfc_cache[oldest][2] < _PATIENT_NFC_CACHE_TTL_SECONDS:
+            break
+        del _patient_nfc_cache[oldest]
+
+
+def _cached_patient_api_dict(patient):
+    """
+    patient.to_api_dict(), reused while the row's (pk, updated_at) is unchanged.
+    The cache holds the encoded JSON, so every call returns a fresh dict that the
+    caller may modify freely.
+    """
+    now = time.monotonic()
+    with _patient_nfc_cache_lock:
+        _expire_patient_nfc_cache(now)
+        cached = _patient_nfc_cache.get(patient.nfc_id)
+    if cached is not None and cached[0] == patient.pk and cached[1] == patient.updated_at:
+        return _json_loads(cached[3])
+    data = patient.to_api_dict()
+    with _patient_nfc_cache_lock:
+        _patient_nfc_cache.pop(patient.nfc_id, None)
+        if len(_patient_nfc_cache) >= _PATIENT_NFC_CACHE_MAXSIZE:
+            _patient_nfc_cache.pop(next(iter(_patient_nfc_cache)))
+        _patient_nfc_cache[patient.nfc_id] = (patient.pk, patient.updated_at, now, _json_dumps(data))
+    return data
+
+
+def _patient_by_nfc(nfc_id):
+    """The patient with this NFC tag, or None (dropping any cached entry for it)."""
+    try:
+        return Patient.objects.get(nfc_id=nfc_id)
+    except Patient.DoesNotExist:
+        _patient_nfc_cache.pop(nfc_id, None)
+        return None
+
+
+def _patient_dict_by_nfc(nfc_id):
+    """to_api_dict() of the patient with this NFC tag, or None."""
+    patient = _patient_by_nfc(nfc_id)
+    return None if patient is None else _cached_patient_api_dict(patient)
+
+
+# Tags per POST /api/nfc/scan-batch/. Lookups are a single IN (...) query: this
+# stays under SQLite's 999 bound-parameter cap (older builds), and in_bulk()
+# splits by the backend's max_query_params on its own if the cap is ever raised.
+MAX_SCAN_BATCH_TAGS = 500
+
+
+def _patient_dicts_by_nfc(nfc_ids):
+    """{nfc_id: to_api_dict()} for the tags that exist."""
+    return {
+        nfc_id: _cached_patient_api_dict(patient)
+        for nfc_id, patient in Patient.objects.in_bulk(nfc_ids, field_name="nfc_id").items()
+    }
+
+
+# Rows per database fetch / per chunk written to the client when streaming lists.
+_STREAM_CHUNK_SIZE = 200
+
+
+def _stream_json_array(records, prefix=b"[", suffix=b"]"):
+    """Yield a JSON array (wrapped in prefix/suffix) a chunk of records at a time."""
+    yield prefix
+    buf = []
+    sep = b""
+    for record in records:
+        buf.append(sep)
+        buf.append(_json_dumps(record))
+        sep = b","
+        if len(buf) >= 2 * _STREAM_CHUNK_SIZE:
+            yield b"".join(buf)
+            buf.clear()
+    if buf:
+        yield b"".join(buf)
+    yield suffix
+
 
 def _get_user_json(profile):
     return profile.to_api_dict()
 
 
+def _req_str(body, *keys, maxlen=None):
+    """
+    First truthy body[key] among keys, stripped and truncated to maxlen in one
+    pass. Non-string values count as missing ("") instead of raising on .strip().
+    """
+    value = None
+    for key in keys:
+        value = body.get(key)
+        if value:
+            break
+    if not isinstance(value, str):
+        return ""
+    value = value.strip()
+    return value[:maxlen] if maxlen else value
+
+
 def _as_string_list(value):
     if value is None:
         return []
@@ -34,20 +227,43 @@ def user_by_id(request, user_id: str):
     try:
         profile = UserProfile.objects.get(user_id=user_id.strip())
     except UserProfile.DoesNotExist:
-        return JsonResponse(
+        return _json_response(
             {"detail": f"No user found for ID '{user_id}'."},
             status=404,
         )
-    return JsonResponse(_get_user_json(profile))
+    return _conditional_json_response(request, profile.pk, profile.updated_at, lambda: _get_user_json(profile))
+
+
+def _api_dicts_in_batches(rows, build):
+    """
+    build(batch) results over rows, one chunk of raw rows at a time (no model
+    instances). The first chunk is fetched and decrypted before this returns, so
+    a bad row there fails the request with an ordinary 500 instead of a 200
+    followed by a truncated array.
+    """
+    rows = iter(rows)
+    first = list(islice(rows, _STREAM_CHUNK_SIZE))
+    return chain(build(first) if first else (), _remaining_api_dicts(rows, build))
+
+
+def _remaining_api_dicts(rows, build):
+    while batch := list(islice(rows, _STREAM_CHUNK_SIZE)):
+        yield from build(batch)
 
 
 @require_GET
 def user_list(request):
     """GET /api/users/ – List all users (user_id only for privacy, or full if needed)."""
-    profiles = UserProfile.objects.all().order_by("user_id")
-    return JsonResponse({
-        "users": [p.to_api_dict() for p in profiles],
-    })
+    # Streamed so memory stays at one chunk of rows instead of every row + dict.
+    rows = (
+        UserProfile.objects.all()  # Meta.ordering = ["user_id"] (unique index)
+        .values_list(*UserProfile.API_ROW_COLUMNS)
+        .iterator(chunk_size=_STREAM_CHUNK_SIZE)
+    )
+    return StreamingHttpResponse(
+        _stream_json_array(_api_dicts_in_batches(rows, UserProfile.api_dicts_from_rows), prefix=b'{"users":[', suffix=b"]}"),
+        content_type="application/json",
+    )
 
 
 @csrf_exempt
@@ -58,19 +274,13 @@ def user_create(request):
     Body: JSON with userId (required), firstName, lastName, email, phone, notes.
     """
     try:
-        body = json.loads(request.body)
+        body = _json_loads(request.body)
     except json.JSONDecodeError:
-        return JsonResponse({"detail": "Invalid JSON."}, status=400)
+        return _detail_response("Invalid JSON.", 400)
 
-    user_id = (body.get("userId") or "").strip()[:15]
+    user_id = _req_str(body, "userId", maxlen=15)
     if not user_id:
-        return JsonResponse({"detail": "userId is required (max 15 characters)."}, status=400)
-
-    if UserProfile.objects.filter(user_id=user_id).exists():
-        return JsonResponse(
-            {"detail": f"A user with ID '{user_id}' already exists."},
-            status=409,
-        )
+        return _detail_response("userId is required (max 15 characters).", 400)
 
     profile = UserProfile(user_id=user_id)
     profile.set_plain_fields(
@@ -80,64 +290,136 @@ def user_create(request):
         phone=body.get("phone", ""),
         notes=body.get("notes", ""),
     )
-    profile.save()
-    return JsonResponse(_get_user_json(profile), status=201)
+    # The unique user_id constraint decides conflicts: one INSERT, no check-then-act race.
+    try:
+        with transaction.atomic():
+            profile.save(force_insert=True)
+    except IntegrityError:
+        return _json_response(
+            {"detail": f"A user with ID '{user_id}' already exists."},
+            status=409,
+        )
+    return _json_response(_get_user_json(profile), status=201)
 
 
 # ----- Patient API (React frontend) -----
 
+def _requested_patient_fields(request):
+    """
+    API keys named by ?fields=a,b (in to_api_dict order), or None when absent.
+    Raises ValueError naming any key that is not in Patient.API_FIELD_COLUMNS.
+    """
+    raw_fields = request.GET.get("fields", "").strip()
+    if not raw_fields:
+        return None
+    requested = {f.strip() for f in raw_fields.split(",") if f.strip()}
+    unknown = sorted(requested - Patient.API_FIELD_COLUMNS.keys())
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}.")
+    return [key for key in Patient.API_FIELD_COLUMNS if key in requested]
+
+
 @require_GET
 def patient_list(request):
-    """GET /api/patients/ – List all patients."""
-    patients = Patient.objects.all().order_by("id")
-    return JsonResponse([p.to_api_dict() for p in patients], safe=False)
+    """
+    GET /api/patients/ – List all patients.
+    Optional ?fields=id,firstName,... returns only those keys and loads only their columns.
+    """
+    try:
+        fields = _requested_patient_fields(request)
+    except ValueError as e:
+        return _json_response({"detail": str(e)}, status=400)
+    # Streamed so memory stays at one chunk of rows instead of every row + dict.
+    rows = (
+        Patient.objects.all()  # Meta.ordering = ["id"] (primary key)
+        .values_list(*Patient.api_row_columns(fields))
+        .iterator(chunk_size=_STREAM_CHUNK_SIZE)
+    )
+    return StreamingHttpResponse(
+        _stream_json_array(
+            _api_dicts_in_batches(rows, lambda batch: Patient.api_dicts_from_rows(batch, fields))
+        ),
+        content_type="application/json",
+    )
+
+
+def _strip_or_none(value):
+    return (value or "").strip() or None
+
+
+def _or_empty(value):
+    return value or ""
+
+
+# (field, camelCase key, snake_case key or None if identical, normalizer or None to keep as-is).
+_PATIENT_BODY_FIELDS = (
+    ("first_name", "firstName", "first_name", _strip_or_none),
+    ("last_name", "lastName", "last_name", _strip_or_none),
+    ("date_of_birth", "dateOfBirth", "date_of_birth", _or_empty),
+    ("gender", "gender", None, _or_empty),
+    ("blood_type", "bloodType", "blood_type", _or_empty),
+    ("status", "status", None, lambda v: v or "active"),
+    ("room", "room", None, _or_empty),
+    ("admission_date", "admissionDate", "admission_date", _or_empty),
+    ("primary_diagnosis", "primaryDiagnosis", "primary_diagnosis", _or_empty),
+    ("insurance_provider", "insuranceProvider", "insurance_provider", _or_empty),
+    ("insurance_id", "insuranceId", "insurance_id", _or_empty),
+    ("use_alberta_health_card", "useAlbertaHealthCard", "use_alberta_health_card", None),
+    ("alberta_health_card_number", "albertaHealthCardNumber", "alberta_health_card_number", _or_empty),
+    ("allergies", "allergies", None, _as_string_list),
+    ("emergency_contact", "emergencyContact", "emergency_contact", lambda v: {} if v is None else v),
+    ("medications", "medications", None, lambda v: [] if v is None else v),
+    ("current_prescriptions", "currentPrescriptions", "current_prescriptions", _as_string_list),
+    ("medical_history", "medicalHistory", "medical_history", _as_string_list),
+    ("past_medical_history", "pastMedicalHistory", "past_medical_history", _as_string_list),
+    ("important_test_results", "importantTestResults", "important_test_results", lambda v: (v or "").strip()),
+    ("notes", "notes", None, lambda v: [] if v is None else v),
+    ("historical_blood_pressure", "historicalBloodPressure", "historical_blood_pressure", None),
+    ("historical_heart_rate", "historicalHeartRate", "historical_heart_rate", None),
+    ("historical_body_weight", "historicalBodyWeight", "historical_body_weight", None),
+    ("family_history", "familyHistory", "family_history", None),
+)
+
+
+# _patient_api_dict_from_body field (model property) -> column backing it.
+_PATIENT_FIELD_COLUMNS = {column.lstrip("_"): column for column in Patient.API_FIELD_COLUMNS.values()}
 
 
 def _patient_api_dict_from_body(body):
-    """Build patient field dict from JSON body (camelCase or snake_case)."""
-    def get(key_camel, key_snake=None):
-        k = key_snake or key_camel
-        return body.get(key_camel) if body.get(key_camel) is not None else body.get(k)
-    return {
-        "first_name": (get("firstName", "first_name") or "").strip() or None,
-        "last_name": (get("lastName", "last_name") or "").strip() or None,
-        "date_of_birth": get("dateOfBirth", "date_of_birth") or "",
-        "gender": get("gender") or "",
-        "blood_type": get("bloodType", "blood_type") or "",
-        "status": get("status") or "active",
-        "room": get("room") or "",
-        "admission_date": get("admissionDate", "admission_date") or "",
-        "primary_diagnosis": get("primaryDiagnosis", "primary_diagnosis") or "",
-        "insurance_provider": get("insuranceProvider", "insurance_provider") or "",
-        "insurance_id": get("insuranceId", "insurance_id") or "",
-        "use_alberta_health_card": get("useAlbertaHealthCard", "use_alberta_health_card") if get("useAlbertaHealthCard", "use_alberta_health_card") is not None else None,
-        "alberta_health_card_number": get("albertaHealthCardNumber", "alberta_health_card_number") or "",
-        "allergies": _as_string_list(get("allergies")),
-        "emergency_contact": get("emergencyContact", "emergency_contact") if get("emergencyContact", "emergency_contact") is not None else {},
-        "medications": get("medications") if get("medications") is not None else [],
-        "current_prescriptions": _as_string_list(get("currentPrescriptions", "current_prescriptions")),
-        "medical_history": _as_string_list(get("medicalHistory", "medical_history")),
-        "past_medical_history": _as_string_list(get("pastMedicalHistory", "past_medical_history")),
-        "important_test_results": (get("importantTestResults", "important_test_results") or "").strip(),
-        "notes": get("notes") if get("notes") is not None else [],
-        "historical_blood_pressure": get("historicalBloodPressure", "historical_blood_pressure") if get("historicalBloodPressure", "historical_blood_pressure") is not None else None,
-        "historical_heart_rate": get("historicalHeartRate", "historical_heart_rate") if get("historicalHeartRate", "historical_heart_rate") is not None else None,
-        "historical_body_weight": get("historicalBodyWeight", "historical_body_weight") if get("historicalBodyWeight", "historical_body_weight") is not None else None,
-        "family_history": get("familyHistory", "family_history") if get("familyHistory", "family_history") is not None else None,
-    }
+    """Build patient field dict from JSON body (camelCase or snake_case; camelCase wins)."""
+    get = body.get
+    out = {}
+    for field, camel, snake, normalize in _PATIENT_BODY_FIELDS:
+        value = get(camel)
+        if value is None and snake is not None:
+            value = get(snake)
+        out[field] = value if normalize is None else normalize(value)
+    return out
 
 
 @require_GET
 def patient_by_id(request, patient_id: str):
-    """GET /api/patients/<id>/ – Get patient by id."""
+    """
+    GET /api/patients/<id>/ – Get patient by id.
+    Optional ?fields=id,firstName,... (as for the list) loads and returns only those keys.
+    """
     try:
-        p = Patient.objects.get(pk=patient_id.strip())
+        fields = _requested_patient_fields(request)
+    except ValueError as e:
+        return _json_response({"detail": str(e)}, status=400)
+    patients = Patient.objects.all()
+    if fields is not None:
+        patients = patients.only(*Patient.api_row_columns(fields), "updated_at")
+    try:
+        p = patients.get(pk=patient_id.strip())
     except Patient.DoesNotExist:
-        return JsonResponse(
+        return _json_response(
             {"detail": f"Patient '{patient_id}' not found."},
             status=404,
         )
-    return JsonResponse(p.to_api_dict())
+    return _conditional_json_response(
+        request, p.pk, p.updated_at, lambda: p.to_api_dict(fields), variant=",".join(fields or ())
+    )
 
 
 @csrf_exempt
@@ -145,37 +427,48 @@ def patient_by_id(request, patient_id: str):
 def patient_update(request, patient_id: str):
     """PUT/PATCH /api/patients/<id>/ – Update patient (full or partial)."""
     try:
-        body = json.loads(request.body) if request.body else {}
+        body = _json_loads(request.body) if request.body else {}
     except json.JSONDecodeError:
-        return JsonResponse({"detail": "Invalid JSON."}, status=400)
-
-    try:
-        p = Patient.objects.get(pk=patient_id.strip())
-    except Patient.DoesNotExist:
-        return JsonResponse(
-            {"detail": f"Patient '{patient_id}' not found."},
-            status=404,
-        )
+        return _detail_response("Invalid JSON.", 400)
 
     data = _patient_api_dict_from_body(body)
-    for key, value in data.items():
-        if value is not None:
-            setattr(p, key, value)
-    p.save()
-    return JsonResponse(p.to_api_dict())
+    pk = patient_id.strip()
+    # Read-modify-write under a row lock so concurrent PATCHes can't drop each other's fields.
+    with transaction.atomic():
+        if connection.vendor == "sqlite":
+            # SQLite ignores FOR UPDATE and opens transactions deferred. Write first
+            # (a no-op UPDATE) so this block takes the write lock, waiting on the busy
+            # timeout, before it reads; upgrading a read snapshot to a write later
+            # fails with "database is locked" instead of waiting.
+            Patient.objects.filter(pk=pk).update(updated_at=F("updated_at"))
+        try:
+            p = Patient.objects.select_for_update().get(pk=pk)
+        except Patient.DoesNotExist:
+            return _json_response(
+                {"detail": f"Patient '{patient_id}' not found."},
+                status=404,
+            )
+        # Only columns whose value actually changes are re-encrypted and written.
+        dirty = []
+        for key, value in data.items():
+            if value is not None and getattr(p, key) != value:
+                setattr(p, key, value)
+                dirty.append(_PATIENT_FIELD_COLUMNS[key])
+        if dirty:
+            p.save(update_fields=[*dirty, "updated_at"])
+    return _json_response(p.to_api_dict())
 
 
 @require_GET
 def patient_by_nfc(request, nfc_id: str):
     """GET /api/patients/by-nfc/<nfc_id>/ – Get patient by NFC tag id."""
-    try:
-        p = Patient.objects.get(nfc_id=nfc_id.strip())
-    except Patient.DoesNotExist:
-        return JsonResponse(
+    p = _patient_by_nfc(nfc_id.strip())
+    if p is None:
+        return _json_response(
             {"detail": f"No patient mapped to NFC tag '{nfc_id}'."},
             status=404,
         )
-    return JsonResponse(p.to_api_dict())
+    return _conditional_json_response(request, p.pk, p.updated_at, lambda: _cached_patient_api_dict(p))
 
 
 @csrf_exempt
@@ -187,26 +480,20 @@ def patient_create(request):
     Uses nfc_id as patient id. Other fields get sensible defaults.
     """
     try:
-        body = json.loads(request.body) if request.body else {}
+        body = _json_loads(request.body) if request.body else {}
     except json.JSONDecodeError:
-        return JsonResponse({"detail": "Invalid JSON."}, status=400)
+        return _detail_response("Invalid JSON.", 400)
 
-    nfc_id = (body.get("nfcId") or body.get("nfc_id") or "").strip()[:15]
-    first_name = (body.get("firstName") or body.get("first_name") or "").strip()
-    last_name = (body.get("lastName") or body.get("last_name") or "").strip()
+    nfc_id = _req_str(body, "nfcId", "nfc_id", maxlen=15)
+    first_name = _req_str(body, "firstName", "first_name")
+    last_name = _req_str(body, "lastName", "last_name")
 
     if not nfc_id:
-        return JsonResponse({"detail": "nfcId is required."}, status=400)
+        return _detail_response("nfcId is required.", 400)
     if not first_name:
-        return JsonResponse({"detail": "firstName is required."}, status=400)
+        return _detail_response("firstName is required.", 400)
     if not last_name:
-        return JsonResponse({"detail": "lastName is required."}, status=400)
-
-    if Patient.objects.filter(nfc_id=nfc_id).exists():
-        return JsonResponse(
-            {"detail": f"A patient is already linked to NFC tag '{nfc_id}'."},
-            status=409,
-        )
+        return _detail_response("lastName is required.", 400)
 
     patient_id = nfc_id
     p = Patient(
@@ -248,8 +535,17 @@ def patient_create(request):
         historical_body_weight=body.get("historicalBodyWeight") or body.get("historical_body_weight") or [],
         family_history=body.get("familyHistory") or body.get("family_history") or [],
     )
-    p.save()
-    return JsonResponse(p.to_api_dict(), status=201)
+    # id == nfc_id and both are unique, so a taken tag fails the INSERT itself.
+    # force_insert also stops save() from UPDATE-ing an existing row with this pk.
+    try:
+        with transaction.atomic():
+            p.save(force_insert=True)
+    except IntegrityError:
+        return _json_response(
+            {"detail": f"A patient is already linked to NFC tag '{nfc_id}'."},
+            status=409,
+        )
+    return _json_response(p.to_api_dict(), status=201)
 
 
 @csrf_exempt
@@ -261,48 +557,85 @@ def nfc_scan(request):
     patients that exist in the database for that nfc_id.
     """
     try:
-        body = json.loads(request.body) if request.body else {}
+        body = _json_loads(request.body) if request.body else {}
     except json.JSONDecodeError:
-        return JsonResponse({"detail": "Body must be valid JSON."}, status=400)
+        return _detail_response("Body must be valid JSON.", 400)
 
-    tag_id = (body.get("tag_id") or "").strip()
+    tag_id = _req_str(body, "tag_id")
     if not tag_id:
-        return JsonResponse(
-            {"detail": "tag_id is required. Use the NFC reader to get the User ID."},
-            status=400,
-        )
+        return _detail_response("tag_id is required. Use the NFC reader to get the User ID.", 400)
 
-    try:
-        p = Patient.objects.get(nfc_id=tag_id)
-        return JsonResponse({"mode": "nfc-tag", "patient": p.to_api_dict()})
-    except Patient.DoesNotExist:
-        return JsonResponse(
+    data = _patient_dict_by_nfc(tag_id)
+    if data is None:
+        return _json_response(
             {"detail": f"No patient mapped to NFC tag '{tag_id}'."},
             status=404,
         )
+    return _json_response({"mode": "nfc-tag", "patient": data})
+
+
+@csrf_exempt
+@require_POST
+def nfc_scan_batch(request):
+    """
+    POST /api/nfc/scan-batch/ – Look up several NFC tags at once (e.g. a tray of wristbands).
+    Body: {"tag_ids": [...]}. Returns {"mode", "patients": {tag_id: patient}, "missing": [...]}.
+    """
+    try:
+        body = _json_loads(request.body) if request.body else {}
+    except json.JSONDecodeError:
+        return _detail_response("Body must be valid JSON.", 400)
+    if not isinstance(body, dict):
+        return _detail_response("Body must be a JSON object.", 400)
+
+    raw_ids = body.get("tag_ids")
+    if not isinstance(raw_ids, list):
+        return _detail_response("tag_ids must be a list of NFC tag IDs.", 400)
+    tag_ids = list(dict.fromkeys(t.strip() for t in raw_ids if isinstance(t, str) and t.strip()))
+    if not tag_ids:
+        return _detail_response("tag_ids is required.", 400)
+    if len(tag_ids) > MAX_SCAN_BATCH_TAGS:
+        return _json_response(
+            {"detail": f"At most {MAX_SCAN_BATCH_TAGS} tag_ids per request."},
+            status=400,
+        )
+
+    found = _patient_dicts_by_nfc(tag_ids)
+    return _json_response({
+        "mode": "nfc-tag-batch",
+        "patients": found,
+        "missing": [t for t in tag_ids if t not in found],
+    })
 
 
 @csrf_exempt
 @require_POST
-def patient_ai_overview(request):
+async def patient_ai_overview(request):
     """
     POST /api/patients/ai-overview/
     Body: JSON with patient_id. Returns AI-generated overview (requires AI_OVERVIEW_API_KEY and AI_OVERVIEW_BASE_URL in .env).
+    Async: under ASGI the upstream call waits in a worker thread rather than on the
+    single thread Django runs sync views on, so it does not stall other requests.
     """
     try:
-        body = json.loads(request.body) if request.body else {}
+        body = _json_loads(request.body) if request.body else {}
     except json.JSONDecodeError:
-        return JsonResponse({"detail": "Invalid JSON."}, status=400)
+        return _detail_response("Invalid JSON.", 400)
 
-    patient_id = (body.get("patient_id") or body.get("patientId") or "").strip()
+    patient_id = _req_str(body, "patient_id", "patientId")
     if not patient_id:
-        return JsonResponse({"detail": "patient_id is required."}, status=400)
+        return _detail_response("patient_id is required.", 400)
 
     try:
-        patient = Patient.objects.get(pk=patient_id)
+        patient = await Patient.objects.aget(pk=patient_id)
     except Patient.DoesNotExist:
-        return JsonResponse({"detail": f"Patient '{patient_id}' not found."}, status=404)
+        return _json_response({"detail": f"Patient '{patient_id}' not found."}, status=404)
+
+    # Scoring and the overview call only read the loaded row, never the DB.
+    return await asyncio.to_thread(_ai_overview_response, patient)
+
 
+def _ai_overview_response(patient):
     prediction = None
     try:
         from risk_scoring.service import RiskScoringService
@@ -312,10 +645,10 @@ def patient_ai_overview(request):
 
     try:
         overview = generate_ai_overview(patient, prediction)
-        return JsonResponse({"overview": overview or ""})
+        return _json_response({"overview": overview or ""})
     except AiOverviewError as e:
         overview = build_fallback_overview(patient, prediction)
-        return JsonResponse(
+        return _json_response(
             {
                 "overview": overview,
                 "source": "fallback",
@@ -332,29 +665,29 @@ def patient_risk_score(request):
     Body: JSON with patient_id. Returns risk band, probability, model version, top factors.
     """
     try:
-        body = json.loads(request.body) if request.body else {}
+        body = _json_loads(request.body) if request.body else {}
     except json.JSONDecodeError:
-        return JsonResponse({"detail": "Invalid JSON."}, status=400)
+        return _detail_response("Invalid JSON.", 400)
 
-    patient_id = (body.get("patient_id") or body.get("patientId") or "").strip()
+    patient_id = _req_str(body, "patient_id", "patientId")
     if not patient_id:
-        return JsonResponse({"detail": "patient_id is required."}, status=400)
+        return _detail_response("patient_id is required.", 400)
 
     try:
         patient = Patient.objects.get(pk=patient_id)
     except Patient.DoesNotExist:
-        return JsonResponse({"detail": f"Patient '{patient_id}' not found."}, status=404)
+        return _json_response({"detail": f"Patient '{patient_id}' not found."}, status=404)
 
     try:
         from risk_scoring.service import RiskScoringService
         prediction = RiskScoringService().predict(patient)
     except Exception as e:
-        return JsonResponse(
+        return _json_response(
             {"detail": f"Risk scoring failed: {e}"},
             status=503,
         )
 
-    return JsonResponse({
+    return _json_response({
         "riskBand": prediction.risk_band,
         "riskProbability": prediction.risk_probability,
         "modelVersion": prediction.model_version,
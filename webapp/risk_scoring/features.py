@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import operator
+import re
 from datetime import date, datetime
+from functools import lru_cache
 from typing import Any, Dict, List
 
 # Compact feature schema shared by training and live scoring.
@@ -42,6 +45,10 @@ SERIOUS_CONDITION_WEIGHTS: Dict[str, float] = {
     "pneumonia": 10.0,
 }
 
+# (keyword, weight) pairs with weights as floats, so scoring iterates a tuple
+# instead of building a dict items view and calling float() per keyword.
+_SERIOUS_CONDITION_ITEMS = tuple((keyword, float(weight)) for keyword, weight in SERIOUS_CONDITION_WEIGHTS.items())
+
 HIGH_RISK_ALLERGY_KEYWORDS = (
     "penicillin",
     "cephalosporin",
@@ -76,6 +83,14 @@ HIGH_RISK_HISTORY_KEYWORDS = tuple(SERIOUS_CONDITION_WEIGHTS.keys()) + (
 
 
 # Parse ISO-like date/datetime strings into a date; return None on empty/invalid.
+# "YYYY-MM-DD[T or whitespace]HH:MM:SS", i.e. the strings the strptime formats below
+# accept in their common zero-padded form; anything else still goes to strptime.
+_ISO_DATETIME_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})(?:[Tt]|\s+)(\d{1,2}):(\d{1,2}):(\d{1,2})")
+
+
+# Memoized: results are immutable and the same few dates recur across a batch,
+# which keeps the strptime fallback (~10x slower than fromisoformat) off repeats.
+@lru_cache(maxsize=4096)
 def _safe_date(value: str) -> date | None:
     if not value:
         return None
@@ -86,6 +101,12 @@ def _safe_date(value: str) -> date | None:
         return date.fromisoformat(raw)
     except ValueError:
         pass
+    m = _ISO_DATETIME_RE.fullmatch(raw)
+    if m:
+        try:
+            return datetime(*map(int, m.groups())).date()
+        except ValueError:
+            pass
     for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"):
         try:
             return datetime.strptime(raw, fmt).date()
@@ -94,20 +115,30 @@ def _safe_date(value: str) -> date | None:
     return None
 
 
+def _item_text(item: Any) -> str:
+    if isinstance(item, str):
+        return item.strip()
+    if isinstance(item, dict):
+        return " ".join([t for t in map(str.strip, map(str, item.values())) if t])
+    return str(item).strip()
+
+
 # Normalize patient fields that may be scalar/list/dict into a clean list[str].
 # This keeps downstream count features stable regardless of source shape.
 def _as_list(value: Any) -> list[str]:
     if not value:
         return []
     if isinstance(value, list):
+        # Patient lists are almost always list[str]: strip those inline, without
+        # a str() copy or a helper call per item.
         out: list[str] = []
         for item in value:
-            if isinstance(item, dict):
-                out.append(" ".join(str(v).strip() for v in item.values() if str(v).strip()))
-            else:
-                out.append(str(item).strip())
-        return [x for x in out if x]
-    return [str(value).strip()] if str(value).strip() else []
+            text = item.strip() if isinstance(item, str) else _item_text(item)
+            if text:
+                out.append(text)
+        return out
+    text = str(value).strip()
+    return [text] if text else []
 
 
 def _serious_condition_score(entries: list[str]) -> float:
@@ -115,10 +146,10 @@ def _serious_condition_score(entries: list[str]) -> float:
         return 0.0
     joined = " ".join(entries).lower()
     score = 0.0
-    for keyword, weight in SERIOUS_CONDITION_WEIGHTS.items():
+    for keyword, weight in _SERIOUS_CONDITION_ITEMS:
         if keyword in joined:
-            score += float(weight)
-    return min(35.0, score)
+            score += weight
+    return score if score < 35.0 else 35.0
 
 
 def _keyword_hit_count(entries: list[str], keywords: tuple[str, ...]) -> int:
@@ -127,35 +158,80 @@ def _keyword_hit_count(entries: list[str], keywords: tuple[str, ...]) -> int:
     hits = 0
     for item in entries:
         text = item.lower()
-        if any(k in text for k in keywords):
-            hits += 1
+        # Explicit loop rather than any(genexpr): no generator frame per entry.
+        for keyword in keywords:
+            if keyword in text:
+                hits += 1
+                break
     return hits
 
 
+# Every patient attribute the feature builder reads, fetched in one attrgetter call.
+_PATIENT_FEATURE_ATTRS = (
+    "date_of_birth",
+    "admission_date",
+    "allergies",
+    "medications",
+    "current_prescriptions",
+    "medical_history",
+    "past_medical_history",
+    "primary_diagnosis",
+    "important_test_results",
+    "status",
+    "gender",
+)
+_get_patient_feature_attrs = operator.attrgetter(*_PATIENT_FEATURE_ATTRS)
+
+
+def _patient_feature_values(patient: Any) -> tuple:
+    try:
+        return _get_patient_feature_attrs(patient)
+    except AttributeError:
+        # Partial objects: missing fields read as None, which every caller below
+        # already treats like the old getattr(..., default) empties.
+        return tuple(getattr(patient, name, None) for name in _PATIENT_FEATURE_ATTRS)
+
+
 # Build one model-ready feature row from a patient object.
 # Computes bounded age/length-of-stay features, count features, and normalized categories.
 def patient_to_feature_dict(patient: Any, *, now_date: date | None = None) -> Dict[str, Any]:
     today = now_date or date.today()
+    (
+        dob_raw,
+        admission_raw,
+        allergies_raw,
+        meds_raw,
+        prescriptions_raw,
+        history_raw,
+        past_history_raw,
+        primary_diagnosis_raw,
+        test_results_raw,
+        status_raw,
+        gender_raw,
+    ) = _patient_feature_values(patient)
 
-    dob = _safe_date(getattr(patient, "date_of_birth", "") or "")
-    admission = _safe_date(getattr(patient, "admission_date", "") or "")
+    dob = _safe_date(dob_raw or "")
+    admission = _safe_date(admission_raw or "")
     age_years_raw = (today - dob).days // 365 if dob else None
     days_since_admission_raw = (today - admission).days if admission else None
     age_years = age_years_raw
     days_since_admission = days_since_admission_raw
+    # Clamps are inline comparisons (same results as max(lo, min(hi, x))) to skip
+    # builtin min/max dispatch on every patient.
     if age_years is not None:
-        age_years = max(0, min(120, age_years))
+        age_years = 0 if age_years < 0 else (age_years if age_years < 120 else 120)
     if days_since_admission is not None:
-        days_since_admission = max(0, min(30, days_since_admission))
-
-    allergies = _as_list(getattr(patient, "allergies", []))
-    meds = _as_list(getattr(patient, "medications", []))
-    prescriptions = _as_list(getattr(patient, "current_prescriptions", []))
-    history = _as_list(getattr(patient, "medical_history", []))
-    past_history = _as_list(getattr(patient, "past_medical_history", []))
-    primary_diagnosis = str(getattr(patient, "primary_diagnosis", "") or "").strip()
-    important_test_results = str(getattr(patient, "important_test_results", "") or "").strip()
-    status = (getattr(patient, "status", "") or "unknown").strip().lower() or "unknown"
+        days = days_since_admission
+        days_since_admission = 0 if days < 0 else (days if days < 30 else 30)
+
+    allergies = _as_list(allergies_raw)
+    meds = _as_list(meds_raw)
+    prescriptions = _as_list(prescriptions_raw)
+    history = _as_list(history_raw)
+    past_history = _as_list(past_history_raw)
+    primary_diagnosis = str(primary_diagnosis_raw or "").strip()
+    important_test_results = str(test_results_raw or "").strip()
+    status = (status_raw or "unknown").strip().lower() or "unknown"
     combined_history = list(history) + list(past_history)
     if primary_diagnosis:
         combined_history.append(primary_diagnosis)
@@ -170,7 +246,7 @@ def patient_to_feature_dict(patient: Any, *, now_date: date | None = None) -> Di
     serious_condition_score += (4.0 * high_risk_allergy_count) + (
         5.0 * high_risk_prescription_count
     )
-    serious_condition_score = min(40.0, serious_condition_score)
+    serious_condition_score = serious_condition_score if serious_condition_score < 40.0 else 40.0
 
     return {
         "age_years": float(age_years) if age_years is not None and age_years >= 0 else 0.0,
@@ -183,10 +259,10 @@ def patient_to_feature_dict(patient: Any, *, now_date: date | None = None) -> Di
         "high_risk_history_count": float(high_risk_history_count),
         "past_history_count": float(len(past_history)),
         "high_risk_prescription_count": float(high_risk_prescription_count),
-        "gender": (getattr(patient, "gender", "") or "unknown").strip().lower() or "unknown",
+        "gender": (gender_raw or "unknown").strip().lower() or "unknown",
         "age_years_raw": float(age_years_raw) if age_years_raw is not None and age_years_raw >= 0 else 0.0,
         "days_since_admission_raw": (
-            float(max(0, days_since_admission_raw))
+            float(days_since_admission_raw if days_since_admission_raw > 0 else 0)
             if days_since_admission_raw is not None
             else 0.0
         ),
@@ -195,128 +271,60 @@ def patient_to_feature_dict(patient: Any, *, now_date: date | None = None) -> Di
         "status": status,
     }
 
+
+# Additive fallback rules shared by heuristic_risk_score and top_heuristic_factors,
+# in scoring order: (feature key, comparison, threshold, contribution, factor label).
+_HEURISTIC_RULES = (
+    ("status", "==", "critical", 0.20, "status=critical"),
+    ("days_since_admission", ">=", 14, 0.10, "days_since_admission>=14"),
+    ("age_years", ">=", 75, 0.08, "age>=75"),
+    ("history_count", ">=", 4, 0.06, "medical_history_count>=4"),
+    ("past_history_count", ">=", 2, 0.04, "past_medical_history_count>=2"),
+    ("medication_count", "==", 0, -0.04, "medications_count=0"),
+    ("allergy_count", ">=", 2, 0.03, "allergy_count>=2"),
+    ("high_risk_allergy_count", ">=", 1, 0.06, "high_risk_allergy_count>=1"),
+    ("current_prescription_count", ">=", 3, 0.04, "current_prescription_count>=3"),
+    ("high_risk_prescription_count", ">=", 1, 0.06, "high_risk_prescription_count>=1"),
+    ("high_risk_history_count", ">=", 1, 0.08, "high_risk_history_count>=1"),
+    ("days_since_admission_raw", ">=", 60, 0.05, "days_since_admission_raw>=60"),
+    ("days_since_admission_raw", ">=", 180, 0.05, "days_since_admission_raw>=180"),
+)
+
+
 # Compute a bounded fallback probability using transparent additive rules.
 # Used when no trained model is available or model prediction fails.
 def heuristic_risk_score(feature_row: Dict[str, Any]) -> float:
     """Same rule-based score used when no trained model is available (0–1)."""
     score = 0.08
-    if feature_row.get("status") == "critical":
-        score += 0.20
-    if (feature_row.get("days_since_admission") or 0) >= 14:
-        score += 0.10
-    if (feature_row.get("age_years") or 0) >= 75:
-        score += 0.08
-    if (feature_row.get("history_count") or 0) >= 4:
-        score += 0.06
-    if (feature_row.get("past_history_count") or 0) >= 2:
-        score += 0.04
-    if (feature_row.get("medication_count") or 0) == 0:
-        score -= 0.04
-    if (feature_row.get("allergy_count") or 0) >= 2:
-        score += 0.03
-    if (feature_row.get("high_risk_allergy_count") or 0) >= 1:
-        score += 0.06
-    if (feature_row.get("current_prescription_count") or 0) >= 3:
-        score += 0.04
-    if (feature_row.get("high_risk_prescription_count") or 0) >= 1:
-        score += 0.06
-    if (feature_row.get("high_risk_history_count") or 0) >= 1:
-        score += 0.08
-    if (feature_row.get("days_since_admission_raw") or 0) >= 60:
-        score += 0.05
-    if (feature_row.get("days_since_admission_raw") or 0) >= 180:
-        score += 0.05
-    score += min(0.15, (feature_row.get("serious_condition_score") or 0.0) / 250.0)
-    return max(0.01, min(0.95, score))
+    for key, op, threshold, contribution, _ in _HEURISTIC_RULES:
+        value = feature_row.get(key) or 0
+        if (value >= threshold) if op == ">=" else (value == threshold):
+            score += contribution
+    severe_bonus = (feature_row.get("serious_condition_score") or 0.0) / 250.0
+    score += severe_bonus if severe_bonus < 0.15 else 0.15
+    score = score if score < 0.95 else 0.95
+    return score if score > 0.01 else 0.01
 
 
 # Return up to 5 rule contributions explaining the heuristic score.
 # Keeps explainability payload shape similar to supervised scoring mode.
 def top_heuristic_factors(feature_row: Dict[str, Any], score: float) -> list[Dict[str, Any]]:
     factors: list[Dict[str, Any]] = []
-    if feature_row["status"] == "critical":
-        factors.append({"feature": "status=critical", "direction": "up", "contribution": 0.20})
-    if feature_row["days_since_admission"] >= 14:
-        factors.append({"feature": "days_since_admission>=14", "direction": "up", "contribution": 0.10})
-    if feature_row["age_years"] >= 75:
-        factors.append({"feature": "age>=75", "direction": "up", "contribution": 0.08})
-    if feature_row["history_count"] >= 4:
-        factors.append(
-            {
-                "feature": "medical_history_count>=4",
-                "direction": "up",
-                "contribution": 0.06,
-            }
-        )
-    if feature_row["past_history_count"] >= 2:
-        factors.append(
-            {
-                "feature": "past_medical_history_count>=2",
-                "direction": "up",
-                "contribution": 0.04,
-            }
-        )
-    if feature_row["medication_count"] == 0:
-        factors.append(
-            {
-                "feature": "medications_count=0",
-                "direction": "down",
-                "contribution": -0.04,
-            }
-        )
-    if feature_row.get("allergy_count", 0) >= 2:
-        factors.append(
-            {"feature": "allergy_count>=2", "direction": "up", "contribution": 0.03}
-        )
-    if feature_row.get("high_risk_allergy_count", 0) >= 1:
-        factors.append(
-            {
-                "feature": "high_risk_allergy_count>=1",
-                "direction": "up",
-                "contribution": 0.06,
-            }
-        )
-    if feature_row.get("current_prescription_count", 0) >= 3:
-        factors.append(
-            {
-                "feature": "current_prescription_count>=3",
-                "direction": "up",
-                "contribution": 0.04,
-            }
-        )
-    if feature_row.get("high_risk_prescription_count", 0) >= 1:
-        factors.append(
-            {
-                "feature": "high_risk_prescription_count>=1",
-                "direction": "up",
-                "contribution": 0.06,
-            }
-        )
-    if feature_row.get("high_risk_history_count", 0) >= 1:
-        factors.append(
-            {
-                "feature": "high_risk_history_count>=1",
-                "direction": "up",
-                "contribution": 0.08,
-            }
-        )
-    if feature_row.get("days_since_admission_raw", 0) >= 60:
-        factors.append(
-            {
-                "feature": "days_since_admission_raw>=60",
-                "direction": "up",
-                "contribution": 0.05,
-            }
-        )
-    if feature_row.get("days_since_admission_raw", 0) >= 180:
+    for key, op, threshold, contribution, label in _HEURISTIC_RULES:
+        value = feature_row.get(key) or 0
+        if not ((value >= threshold) if op == ">=" else (value == threshold)):
+            continue
         factors.append(
             {
-                "feature": "days_since_admission_raw>=180",
-                "direction": "up",
-                "contribution": 0.05,
+                "feature": label,
+                "direction": "up" if contribution >= 0 else "down",
+                "contribution": contribution,
             }
         )
-    severe_bonus = min(0.12, (feature_row.get("serious_condition_score") or 0.0) / 300.0)
+        if len(factors) == 5:
+            return factors
+    severe_bonus = (feature_row.get("serious_condition_score") or 0.0) / 300.0
+    severe_bonus = severe_bonus if severe_bonus < 0.12 else 0.12
     if severe_bonus > 0:
         factors.append(
             {
@@ -328,7 +336,40 @@ def top_heuristic_factors(feature_row: Dict[str, Any], score: float) -> list[Dic
 
     if not factors:
         factors.append({"feature": "baseline_risk", "direction": "up", "contribution": round(score, 4)})
-    return factors[:5]
+    return factors
+
+
+# Column-wise (struct-of-arrays) view of feature rows: one float64 array per
+# numeric column (missing/NaN -> 0) and one normalized-string array per
+# categorical column, ready to wrap in a DataFrame without further coercion.
+def feature_rows_to_soa(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Raises TypeError/ValueError when a numeric cell needs pandas-style coercion."""
+    import numpy as np
+
+    n = len(rows)
+    # Feature rows are plain floats, so each numeric column is one C-level float64
+    # fill instead of a to_numeric/fillna/astype pass per column.
+    columns: Dict[str, Any] = {}
+    for col in FEATURE_NUMERIC_COLUMNS:
+        values = np.fromiter([row.get(col, 0.0) for row in rows], dtype=np.float64, count=n)
+        values[np.isnan(values)] = 0.0
+        columns[col] = values
+    for col in FEATURE_CATEGORICAL_COLUMNS:
+        values = [row.get(col) for row in rows]
+        if all(value is None or isinstance(value, str) for value in values):
+            normalized = [
+                "unknown" if value is None else (value.strip().lower() or "unknown")
+                for value in values
+            ]
+            columns[col] = np.array(normalized, dtype=object)
+        else:
+            import pandas as pd
+
+            columns[col] = (
+                pd.Series(values).fillna("unknown").astype(str).str.strip().str.lower()
+                .replace("", "unknown").to_numpy()
+            )
+    return columns
 
 
 # Convert feature dict rows into a DataFrame expected by the sklearn pipeline.
@@ -339,6 +380,17 @@ def feature_dicts_to_dataframe(rows: List[Dict[str, Any]]):
 
     if not rows:
         return pd.DataFrame(columns=FEATURE_COLUMN_ORDER)
+    try:
+        columns = feature_rows_to_soa(rows)
+    except (TypeError, ValueError):
+        return _feature_dicts_to_dataframe_coerced(rows)
+    return pd.DataFrame(columns, columns=FEATURE_COLUMN_ORDER, copy=False)
+
+
+# Slow path for rows holding non-numeric values (e.g. strings); coerces them to 0 like pandas.
+def _feature_dicts_to_dataframe_coerced(rows: List[Dict[str, Any]]):
+    import pandas as pd
+
     df = pd.DataFrame(rows, columns=FEATURE_COLUMN_ORDER)
     # Ensure numeric columns are numeric (fill missing with 0)
     for col in FEATURE_NUMERIC_COLUMNS:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List
@@ -9,7 +10,10 @@ from typing import Any, Dict, List
 from django.conf import settings
 
 from .features import (
+    FEATURE_CATEGORICAL_COLUMNS,
+    FEATURE_NUMERIC_COLUMNS,
     feature_dicts_to_dataframe,
+    feature_rows_to_soa,
     heuristic_risk_score,
     patient_to_feature_dict,
     top_heuristic_factors,
@@ -17,6 +21,12 @@ from .features import (
 
 logger = logging.getLogger(__name__)
 
+# Loaded payload shared by every RiskScoringService (views build one per request).
+# Keyed by the ordered candidate artifacts and their mtimes, so a new, replaced
+# or removed artifact triggers a reload on the next call.
+_payload_cache_lock = threading.Lock()
+_payload_cache: Dict[str, Any] = {"key": None, "payload": None, "error": None, "scorer": None}
+
 
 @dataclass
 class RiskPrediction:
@@ -30,6 +40,136 @@ class RiskPrediction:
     assessment_recommendation: str
 
 
+# Plain-array copy of one fitted preprocess -> LogisticRegression pipeline of the
+# shape train.py writes (StandardScaler numerics, one-hot gender). Same arithmetic
+# as sklearn, minus the DataFrame and ColumnTransformer dispatch per call.
+@dataclass(frozen=True)
+class _LinearModel:
+    mean: Any
+    scale: Any
+    gender_index: Dict[str, int]
+    coef: Any
+    intercept: Any
+    feature_names: List[str]
+
+    def transform(self, numeric, genders: List[str]):
+        import numpy as np
+
+        transformed = np.zeros((len(genders), self.coef.shape[1]))
+        width = numeric.shape[1]
+        transformed[:, :width] = (numeric - self.mean) / self.scale
+        for i, gender in enumerate(genders):
+            idx = self.gender_index.get(gender)
+            if idx is not None:
+                transformed[i, width + idx] = 1.0
+        return transformed
+
+    def decision_function(self, transformed):
+        return (transformed @ self.coef.T + self.intercept).ravel()
+
+
+# Payload pipeline (used for factors) plus the sigmoid-calibrated fold members,
+# or no members when the payload has no calibrator.
+@dataclass(frozen=True)
+class _LinearScorer:
+    explain: _LinearModel
+    members: List[tuple] | None
+
+    # Returns (probabilities, explain-transformed rows), or None when a row holds
+    # values only the DataFrame path knows how to coerce.
+    def predict_proba(self, feature_rows: List[Dict[str, Any]]):
+        import numpy as np
+        from scipy.special import expit
+
+        try:
+            columns = feature_rows_to_soa(feature_rows)
+        except (TypeError, ValueError):
+            return None
+        numeric = np.column_stack([columns[col] for col in FEATURE_NUMERIC_COLUMNS])
+        genders = list(columns["gender"])
+
+        transformed = self.explain.transform(numeric, genders)
+        if self.members is None:
+            return expit(self.explain.decision_function(transformed)), transformed
+        total = np.zeros(len(genders))
+        for model, a, b in self.members:
+            decision = model.decision_function(model.transform(numeric, genders))
+            total += expit(-(a * decision + b))
+        return total / len(self.members), transformed
+
+
+def _linear_model(pipeline: Any) -> _LinearModel | None:
+    import numpy as np
+    from sklearn.compose import ColumnTransformer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    steps = getattr(pipeline, "named_steps", None)
+    if steps is None or list(steps) != ["preprocess", "model"]:
+        return None
+    preprocess, model = steps["preprocess"], steps["model"]
+    if type(preprocess) is not ColumnTransformer or type(model) is not LogisticRegression:
+        return None
+    fitted = [
+        (estimator, list(columns))
+        for name, estimator, columns in preprocess.transformers_
+        if not (name == "remainder" and estimator == "drop")
+    ]
+    if len(fitted) != 2:
+        return None
+    (scaler, numeric_columns), (encoder, categorical_columns) = fitted
+    if type(scaler) is not StandardScaler or numeric_columns != FEATURE_NUMERIC_COLUMNS:
+        return None
+    if (
+        type(encoder) is not OneHotEncoder
+        or categorical_columns != FEATURE_CATEGORICAL_COLUMNS
+        or encoder.handle_unknown != "ignore"
+        or encoder.drop_idx_ is not None
+        or getattr(encoder, "_infrequent_enabled", False)
+    ):
+        return None
+    categories = [str(c) for c in encoder.categories_[0]]
+    width = len(numeric_columns)
+    if model.coef_.shape != (1, width + len(categories)) or len(model.classes_) != 2:
+        return None
+    return _LinearModel(
+        mean=scaler.mean_ if scaler.with_mean else np.zeros(width),
+        scale=scaler.scale_ if scaler.with_std else np.ones(width),
+        gender_index={category: idx for idx, category in enumerate(categories)},
+        coef=model.coef_,
+        intercept=model.intercept_,
+        feature_names=[str(name) for name in preprocess.get_feature_names_out()],
+    )
+
+
+# Build a _LinearScorer when the payload matches the supported shape exactly;
+# anything else (other estimators, isotonic calibration) keeps the sklearn path.
+def _compile_linear_scorer(payload: Dict[str, Any]) -> _LinearScorer | None:
+    try:
+        explain = _linear_model(payload.get("pipeline"))
+        if explain is None:
+            return None
+        calibrator = payload.get("calibrator")
+        if calibrator is None:
+            return _LinearScorer(explain=explain, members=None)
+        if (
+            type(calibrator).__name__ != "CalibratedClassifierCV"
+            or calibrator.method != "sigmoid"
+            or len(calibrator.classes_) != 2
+        ):
+            return None
+        members = []
+        for calibrated in calibrator.calibrated_classifiers_:
+            model = _linear_model(calibrated.estimator)
+            if model is None or len(calibrated.calibrators) != 1:
+                return None
+            sigmoid = calibrated.calibrators[0]
+            members.append((model, sigmoid.a_, sigmoid.b_))
+        return _LinearScorer(explain=explain, members=members)
+    except Exception:
+        return None
+
+
 class RiskScoringService:
     # Resolve artifact path relative to Django BASE_DIR and track latest load error.
     def __init__(self):
@@ -351,79 +491,102 @@ class RiskScoringService:
     # Main runtime entrypoint: build features, run supervised model, fallback if needed.
     # Returns API-ready prediction payload fields via RiskPrediction.
     def predict(self, patient: Any) -> RiskPrediction:
-        feature_row = patient_to_feature_dict(patient)
+        return self.predict_batch([patient])[0]
+
+    # Score many patients with one model load and one vectorized pass (plain
+    # arrays when the payload compiles to a _LinearScorer, else one DataFrame and
+    # predict_proba call); results come back in input order. Any model failure
+    # falls back to the heuristic for the whole batch, as predict() does for one.
+    def predict_batch(self, patients: List[Any]) -> List[RiskPrediction]:
+        feature_rows = [patient_to_feature_dict(patient) for patient in patients]
+        if not feature_rows:
+            return []
         model_payload = self._load_latest_model_payload()
         if not model_payload:
-            score = self._heuristic_score(feature_row)
-            score, context_factors = self._context_adjust_probability(
-                score,
-                feature_row,
-                thresholds=None,
-            )
-            pre_band = self._to_band(score)
-            seriousness_factor, seriousness_level, assessment_recommendation = (
-                self._seriousness_assessment(score, pre_band, feature_row)
-            )
-            risk_probability, risk_band = self._risk_from_seriousness(
-                seriousness_factor, seriousness_level
-            )
-            factors = self._merge_top_factors(
-                top_heuristic_factors(feature_row, score),
-                context_factors,
-            )
-            return RiskPrediction(
-                risk_probability=risk_probability,
-                risk_band=risk_band,
-                model_version="heuristic-v1",
-                top_factors=factors,
-                scoring_mode="heuristic",
-                seriousness_factor=seriousness_factor,
-                seriousness_level=seriousness_level,
-                assessment_recommendation=assessment_recommendation,
-            )
+            return [self._heuristic_prediction(row) for row in feature_rows]
 
         pipeline = model_payload.get("pipeline")
         calibrator = model_payload.get("calibrator")
         thresholds = model_payload.get("band_thresholds")
-        X = feature_dicts_to_dataframe([feature_row])
+        scorer = self._linear_scorer(model_payload)
 
         try:
-            if calibrator is not None:
-                prob = calibrator.predict_proba(X)[:, 1][0]
+            scored = scorer.predict_proba(feature_rows) if scorer is not None else None
+            if scored is not None:
+                probs, transformed = scored
+                factors_by_row = self._factors_from_contributions(
+                    scorer.explain.feature_names, transformed, scorer.explain.coef[0]
+                )
             else:
-                prob = pipeline.predict_proba(X)[:, 1][0]
-            prob = float(max(0.0, min(1.0, prob)))
-            factors = self._top_model_factors(model_payload, X)
+                X = feature_dicts_to_dataframe(feature_rows)
+                if calibrator is not None:
+                    probs = calibrator.predict_proba(X)[:, 1]
+                else:
+                    probs = self._positive_class_proba(pipeline, X)
+                factors_by_row = self._top_model_factors(model_payload, X)
+            probs = [float(max(0.0, min(1.0, prob))) for prob in probs]
         except Exception as exc:
             logger.warning("Risk model prediction failed, using heuristic fallback: %s", exc)
-            score = self._heuristic_score(feature_row)
-            score, context_factors = self._context_adjust_probability(
-                score,
-                feature_row,
-                thresholds=None,
-            )
-            pre_band = self._to_band(score)
-            seriousness_factor, seriousness_level, assessment_recommendation = (
-                self._seriousness_assessment(score, pre_band, feature_row)
-            )
-            risk_probability, risk_band = self._risk_from_seriousness(
-                seriousness_factor, seriousness_level
-            )
-            factors = self._merge_top_factors(
-                top_heuristic_factors(feature_row, score),
-                context_factors,
-            )
-            return RiskPrediction(
-                risk_probability=risk_probability,
-                risk_band=risk_band,
-                model_version="heuristic-v1",
-                top_factors=factors,
-                scoring_mode="heuristic",
-                seriousness_factor=seriousness_factor,
-                seriousness_level=seriousness_level,
-                assessment_recommendation=assessment_recommendation,
-            )
+            return [self._heuristic_prediction(row) for row in feature_rows]
+
+        return [
+            self._supervised_prediction(model_payload, row, prob, factors, thresholds)
+            for row, prob, factors in zip(feature_rows, probs, factors_by_row)
+        ]
+
+    # P(positive) from an uncalibrated pipeline. For a binary LogisticRegression that
+    # is expit(decision_function), bit-for-bit predict_proba's second column,
+    # without building the negative-class column.
+    @staticmethod
+    def _positive_class_proba(pipeline: Any, X):
+        from sklearn.linear_model import LogisticRegression
+
+        model = pipeline.named_steps.get("model")
+        if type(model) is LogisticRegression and len(model.classes_) == 2:
+            from scipy.special import expit
+
+            return expit(pipeline.decision_function(X))
+        return pipeline.predict_proba(X)[:, 1]
+
+    # Heuristic-only prediction used when no model is available or it fails.
+    def _heuristic_prediction(self, feature_row: Dict[str, Any]) -> RiskPrediction:
+        score = self._heuristic_score(feature_row)
+        score, context_factors = self._context_adjust_probability(
+            score,
+            feature_row,
+            thresholds=None,
+        )
+        pre_band = self._to_band(score)
+        seriousness_factor, seriousness_level, assessment_recommendation = (
+            self._seriousness_assessment(score, pre_band, feature_row)
+        )
+        risk_probability, risk_band = self._risk_from_seriousness(
+            seriousness_factor, seriousness_level
+        )
+        factors = self._merge_top_factors(
+            top_heuristic_factors(feature_row, score),
+            context_factors,
+        )
+        return RiskPrediction(
+            risk_probability=risk_probability,
+            risk_band=risk_band,
+            model_version="heuristic-v1",
+            top_factors=factors,
+            scoring_mode="heuristic",
+            seriousness_factor=seriousness_factor,
+            seriousness_level=seriousness_level,
+            assessment_recommendation=assessment_recommendation,
+        )
 
+    # Apply context adjustment and seriousness mapping to one model probability.
+    def _supervised_prediction(
+        self,
+        model_payload: Dict[str, Any],
+        feature_row: Dict[str, Any],
+        prob: float,
+        factors: List[Dict[str, Any]],
+        thresholds: Dict[str, Any] | None,
+    ) -> RiskPrediction:
         prob, context_factors = self._context_adjust_probability(
             prob,
             feature_row,
@@ -475,10 +638,10 @@ class RiskScoringService:
             return aliases.get(raw, raw)
         return aliases.get(name, name)
 
-    # Compute per-patient top contributions as transformed_value * coefficient.
-    # Falls back to stored top weights for older artifact formats.
-    def _top_model_factors(self, model_payload: Dict[str, Any], X):
-        factors: List[Dict[str, Any]] = []
+    # Compute per-patient top contributions as transformed_value * coefficient,
+    # one factor list per row of X. Falls back to stored top weights for older
+    # artifact formats.
+    def _top_model_factors(self, model_payload: Dict[str, Any], X) -> List[List[Dict[str, Any]]]:
         try:
             import numpy as np
 
@@ -487,9 +650,37 @@ class RiskScoringService:
             model = pipeline.named_steps["model"]
             names = preprocess.get_feature_names_out()
             transformed = preprocess.transform(X)
-            row = transformed.toarray()[0] if hasattr(transformed, "toarray") else np.asarray(transformed)[0]
-            coefs = model.coef_[0]
-            contributions = np.asarray(row) * np.asarray(coefs)
+            rows = transformed.toarray() if hasattr(transformed, "toarray") else np.asarray(transformed)
+            factors_by_row = self._factors_from_contributions(names, rows, model.coef_[0])
+        except Exception:
+            # Backward-compatible fallback for older model payloads.
+            factors = []
+            top_names = model_payload.get("top_feature_names", [])
+            top_weights = model_payload.get("top_feature_weights", [])
+            for idx, name in enumerate(top_names[:5]):
+                weight = float(top_weights[idx]) if idx < len(top_weights) else 0.0
+                factors.append(
+                    {
+                        "feature": self._humanize_feature_name(str(name)),
+                        "direction": "up" if weight >= 0 else "down",
+                        "contribution": round(weight, 4),
+                    }
+                )
+            factors_by_row = [
+                [dict(factor) for factor in factors] or [self._intercept_factor()]
+                for _ in range(len(X))
+            ]
+        return factors_by_row
+
+    # Top five |transformed_value * coefficient| factors for each transformed row.
+    def _factors_from_contributions(self, names, rows, coefs) -> List[List[Dict[str, Any]]]:
+        import numpy as np
+
+        coefs = np.asarray(coefs)
+        factors_by_row = []
+        for row in rows:
+            factors: List[Dict[str, Any]] = []
+            contributions = np.asarray(row) * coefs
 
             order = np.argsort(np.abs(contributions))[::-1]
             for idx in order:
@@ -505,25 +696,12 @@ class RiskScoringService:
                 )
                 if len(factors) >= 5:
                     break
-        except Exception:
-            # Backward-compatible fallback for older model payloads.
-            top_names = model_payload.get("top_feature_names", [])
-            top_weights = model_payload.get("top_feature_weights", [])
-            for idx, name in enumerate(top_names[:5]):
-                weight = float(top_weights[idx]) if idx < len(top_weights) else 0.0
-                factors.append(
-                    {
-                        "feature": self._humanize_feature_name(str(name)),
-                        "direction": "up" if weight >= 0 else "down",
-                        "contribution": round(weight, 4),
-                    }
-                )
+            factors_by_row.append(factors or [self._intercept_factor()])
+        return factors_by_row
 
-        if not factors:
-            factors.append(
-                {"feature": "model_intercept", "direction": "up", "contribution": 0.0}
-            )
-        return factors
+    @staticmethod
+    def _intercept_factor() -> Dict[str, Any]:
+        return {"feature": "model_intercept", "direction": "up", "contribution": 0.0}
 
     # Load newest readable risk_model_*.joblib payload; skip unreadable artifacts.
     # Stores last failure message for diagnostics without crashing requests.
@@ -542,12 +720,14 @@ class RiskScoringService:
             f"risk_model_{configured_version}.joblib" if configured_version else ""
         )
 
-        def _artifact_sort_key(path: Path) -> tuple[int, int, float]:
+        mtimes = {path: path.stat().st_mtime_ns for path in model_files}
+
+        def _artifact_sort_key(path: Path) -> tuple[int, int, int]:
             # Prefer higher semantic version (risk-v3 > risk-v2 > risk-v1), then newer timestamp.
             m = re.match(r"risk_model_risk-v(\d+)-(\d+)\.joblib$", path.name)
             if m:
-                return (int(m.group(1)), int(m.group(2)), float(path.stat().st_mtime))
-            return (0, 0, float(path.stat().st_mtime))
+                return (int(m.group(1)), int(m.group(2)), mtimes[path])
+            return (0, 0, mtimes[path])
 
         ordered_files = sorted(model_files, key=_artifact_sort_key, reverse=True)
         if configured_filename:
@@ -555,15 +735,37 @@ class RiskScoringService:
             other_paths = [p for p in ordered_files if p.name != configured_filename]
             ordered_files = configured_paths + other_paths
 
-        for model_path in ordered_files:
-            try:
-                payload = joblib.load(model_path)
-                self._last_load_error = None
-                return payload
-            except Exception as exc:
-                self._last_load_error = f"{type(exc).__name__}: {exc}"
-                logger.warning(
-                    "Unable to load risk model '%s': %s", model_path.name, self._last_load_error
-                )
-                continue
+        cache_key = tuple((str(p), mtimes[p]) for p in ordered_files)
+        with _payload_cache_lock:
+            if _payload_cache["key"] == cache_key:
+                self._last_load_error = _payload_cache["error"]
+                return _payload_cache["payload"]
+
+            payload = None
+            for model_path in ordered_files:
+                try:
+                    payload = joblib.load(model_path)
+                    self._last_load_error = None
+                    break
+                except Exception as exc:
+                    self._last_load_error = f"{type(exc).__name__}: {exc}"
+                    logger.warning(
+                        "Unable to load risk model '%s': %s", model_path.name, self._last_load_error
+                    )
+                    continue
+            _payload_cache.update(
+                key=cache_key,
+                payload=payload,
+                error=self._last_load_error,
+                scorer=_compile_linear_scorer(payload) if payload else None,
+            )
+            return payload
+
+    # Compiled scorer for the cached payload; None sends predict_batch down the
+    # sklearn path (unsupported payload shape, or the cache moved on meanwhile).
+    @staticmethod
+    def _linear_scorer(model_payload: Dict[str, Any]) -> _LinearScorer | None:
+        with _payload_cache_lock:
+            if _payload_cache["payload"] is model_payload:
+                return _payload_cache["scorer"]
         return None
@@ -0,0 +1,57 @@
+import random
+import warnings
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from risk_scoring.features import FEATURE_NUMERIC_COLUMNS, feature_dicts_to_dataframe
+from risk_scoring.service import _compile_linear_scorer
+
+ARTIFACTS_DIR = Path(__file__).resolve().parent / "artifacts"
+
+
+def _feature_rows(count: int = 200):
+    rng = random.Random(7)
+    rows = []
+    for _ in range(count):
+        row = {col: float(rng.randint(0, 40)) for col in FEATURE_NUMERIC_COLUMNS}
+        row["age_years"] = float(rng.randint(0, 100))
+        row["gender"] = rng.choice(["female", "male", "unknown", "other"])
+        rows.append(row)
+    return rows
+
+
+class LinearScorerParityTests(SimpleTestCase):
+    """_LinearScorer re-implements the saved sklearn estimators; keep it in lockstep."""
+
+    def _assert_matches(self, scorer, estimator, pipeline, rows):
+        import numpy as np
+
+        probs, transformed = scorer.predict_proba(rows)
+        frame = feature_dicts_to_dataframe(rows)
+        np.testing.assert_allclose(probs, estimator.predict_proba(frame)[:, 1], rtol=0, atol=1e-12)
+        np.testing.assert_allclose(
+            transformed, pipeline.named_steps["preprocess"].transform(frame), rtol=0, atol=1e-12
+        )
+
+    def test_scorer_matches_sklearn_on_bundled_artifacts(self):
+        import joblib
+
+        rows = _feature_rows()
+        compiled = 0
+        for path in sorted(ARTIFACTS_DIR.glob("risk_model_*.joblib")):
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                payload = joblib.load(path)
+            scorer = _compile_linear_scorer(payload)
+            if scorer is None:
+                # Older feature layouts stay on the sklearn path.
+                continue
+            compiled += 1
+            pipeline = payload["pipeline"]
+            with self.subTest(artifact=path.name):
+                self._assert_matches(scorer, payload.get("calibrator") or pipeline, pipeline, rows)
+            with self.subTest(artifact=path.name, calibrator=None):
+                uncalibrated = _compile_linear_scorer({"pipeline": pipeline})
+                self._assert_matches(uncalibrated, pipeline, pipeline, rows)
+        self.assertGreater(compiled, 0, "no bundled artifact compiled to a _LinearScorer")
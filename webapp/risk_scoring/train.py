@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List
 
 from django.conf import settings
 
@@ -12,7 +12,6 @@ from .features import (
     FEATURE_CATEGORICAL_COLUMNS,
     FEATURE_COLUMN_ORDER,
     FEATURE_NUMERIC_COLUMNS,
-    feature_dicts_to_dataframe,
 )
 
 
@@ -45,13 +44,103 @@ def _age_bracket_to_years(age_str: str) -> float:
     return float((lo + hi) // 2)
 
 
+# Per-unique-value mapping: UCI categorical columns hold a handful of distinct
+# strings, so each Python-level conversion runs once per value, not per row.
+def _map_unique(series, fn, dtype=object):
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return np.asarray([fn(value) for value in uniques], dtype=dtype)[codes]
+
+
+def _int_column(df, name: str):
+    """Column as int64 with missing values -> 0, truncating like int() per cell."""
+    import numpy as np
+    import pandas as pd
+
+    if name not in df.columns:
+        return np.zeros(len(df), dtype=np.int64)
+    series = df[name]
+    if pd.api.types.is_numeric_dtype(series):
+        return series.fillna(0).to_numpy().astype(np.int64)
+    return _map_unique(series, lambda v: int(v) if pd.notna(v) else 0, dtype=np.int64)
+
+
+def _column_or_default(df, name: str, default: object):
+    import pandas as pd
+
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def _uci_gender(value: object) -> str:
+    gender = (str(value).strip().lower() or "unknown")[:20]
+    return gender if gender in ("male", "female", "unknown") else "unknown"
+
+
+# Only these UCI columns feed the feature mapping; the other ~40 are never parsed.
+_UCI_CSV_COLUMNS = frozenset(
+    {
+        "age",
+        "gender",
+        "time_in_hospital",
+        "num_medications",
+        "number_diagnoses",
+        "number_inpatient",
+        "number_outpatient",
+        "number_emergency",
+        "readmitted",
+    }
+)
+
+
+# Vectorized UCI -> app feature mapping: one NumPy expression per feature column
+# instead of a per-row iterrows() loop. Returns (column arrays, int8 labels).
+def _training_columns_from_frame(df):
+    import numpy as np
+
+    time_in_hospital = _int_column(df, "time_in_hospital")
+    num_medications = _int_column(df, "num_medications")
+    number_diagnoses = _int_column(df, "number_diagnoses")
+    number_inpatient = _int_column(df, "number_inpatient")
+    number_outpatient = _int_column(df, "number_outpatient")
+    number_emergency = _int_column(df, "number_emergency")
+    prior_utilization = number_inpatient + number_outpatient + number_emergency
+
+    columns = {
+        "age_years": _map_unique(
+            _column_or_default(df, "age", ""),
+            lambda v: _age_bracket_to_years(str(v)),
+            dtype=np.float64,
+        ),
+        "days_since_admission": np.clip(time_in_hospital, 0, 30).astype(np.float64),
+        "medication_count": np.maximum(0, num_medications).astype(np.float64),
+        "current_prescription_count": np.maximum(0, num_medications // 2).astype(np.float64),
+        "allergy_count": np.clip(number_emergency, 0, 4).astype(np.float64),
+        "high_risk_allergy_count": (number_emergency >= 2).astype(np.float64),
+        "history_count": np.maximum(0, number_diagnoses).astype(np.float64),
+        "high_risk_history_count": ((number_inpatient + number_emergency) >= 2).astype(np.float64),
+        "past_history_count": np.maximum(0, prior_utilization).astype(np.float64),
+        "high_risk_prescription_count": (num_medications >= 12).astype(np.float64),
+        "gender": _map_unique(_column_or_default(df, "gender", "unknown"), _uci_gender),
+    }
+    labels = _map_unique(
+        _column_or_default(df, "readmitted", "NO"),
+        lambda v: 1 if str(v).strip() == "<30" else 0,
+        dtype=np.int8,
+    )
+    return columns, labels
+
+
 def _build_training_rows_from_csv(
     csv_path: Path,
     *,
     max_rows: int | None = 50_000,
     random_state: int = 42,
-) -> Tuple[List[Dict[str, object]], List[int]]:
-    """Load UCI CSV and map each row to the app's feature schema + binary label."""
+):
+    """Load UCI CSV and map it to a feature DataFrame (FEATURE_COLUMN_ORDER) + int8 labels."""
     try:
         import pandas as pd
     except ImportError as exc:
@@ -64,47 +153,14 @@ def _build_training_rows_from_csv(
             "Provide --csv-path or place diabetic_data.csv in webapp/risk_scoring/data/."
         )
 
-    df = pd.read_csv(csv_path)
+    # Callable usecols tolerates CSVs missing some of these (defaults apply below).
+    df = pd.read_csv(csv_path, usecols=lambda name: name in _UCI_CSV_COLUMNS)
     if max_rows and max_rows > 0 and len(df) > max_rows:
         df = df.sample(n=max_rows, random_state=random_state).reset_index(drop=True)
 
-    rows: List[Dict[str, object]] = []
-    labels: List[int] = []
-
-    for _, r in df.iterrows():
-        age_years = _age_bracket_to_years(str(r.get("age", "")))
-        time_in_hospital = int(r.get("time_in_hospital", 0)) if pd.notna(r.get("time_in_hospital")) else 0
-        num_medications = int(r.get("num_medications", 0)) if pd.notna(r.get("num_medications")) else 0
-        number_diagnoses = int(r.get("number_diagnoses", 0)) if pd.notna(r.get("number_diagnoses")) else 0
-        number_inpatient = int(r.get("number_inpatient", 0)) if pd.notna(r.get("number_inpatient")) else 0
-        number_outpatient = int(r.get("number_outpatient", 0)) if pd.notna(r.get("number_outpatient")) else 0
-        number_emergency = int(r.get("number_emergency", 0)) if pd.notna(r.get("number_emergency")) else 0
-        prior_utilization = number_inpatient + number_outpatient + number_emergency
-
-        gender = (str(r.get("gender", "unknown")).strip().lower() or "unknown")[:20]
-        if gender not in ("male", "female", "unknown"):
-            gender = "unknown"
-
-        rows.append(
-            {
-                "age_years": float(age_years),
-                "days_since_admission": float(max(0, min(30, time_in_hospital))),
-                "medication_count": float(max(0, num_medications)),
-                "current_prescription_count": float(max(0, num_medications // 2)),
-                "allergy_count": float(max(0, min(4, number_emergency))),
-                "high_risk_allergy_count": float(1 if number_emergency >= 2 else 0),
-                "history_count": float(max(0, number_diagnoses)),
-                "high_risk_history_count": float(
-                    1 if (number_inpatient + number_emergency) >= 2 else 0
-                ),
-                "past_history_count": float(max(0, prior_utilization)),
-                "high_risk_prescription_count": float(1 if num_medications >= 12 else 0),
-                "gender": gender,
-            }
-        )
-        labels.append(1 if str(r.get("readmitted", "NO")).strip() == "<30" else 0)
-
-    return rows, labels
+    columns, labels = _training_columns_from_frame(df)
+    # Columns are already typed arrays, so the frame wraps them without a copy.
+    return pd.DataFrame(columns, columns=FEATURE_COLUMN_ORDER, copy=False), labels
 
 
 def _fit_and_save_pipeline(X, labels: List[int], model_dir: Path, model_version: str) -> TrainingResult:
@@ -127,7 +183,8 @@ def _fit_and_save_pipeline(X, labels: List[int], model_dir: Path, model_version:
         raise TypeError("X must be a pandas DataFrame")
 
     n = len(X)
-    positives = int(sum(labels))
+    # np.sum, not sum(): Python-level addition of int8 scalars would wrap at 127.
+    positives = int(np.sum(labels))
     negatives = int(n - positives)
     if n < 3:
         raise ValueError(f"Need at least 3 rows, got {n}")
@@ -137,23 +194,27 @@ def _fit_and_save_pipeline(X, labels: List[int], model_dir: Path, model_version:
         missing = [col for col in FEATURE_COLUMN_ORDER if col not in X.columns]
         raise ValueError(f"Missing required feature columns: {missing}")
 
-    def _build_pipeline(c_value: float = 1.0) -> Pipeline:
-        preprocess = ColumnTransformer(
+    def _build_preprocess() -> ColumnTransformer:
+        return ColumnTransformer(
             transformers=[
                 ("num", StandardScaler(), FEATURE_NUMERIC_COLUMNS),
                 ("cat", OneHotEncoder(handle_unknown="ignore"), FEATURE_CATEGORICAL_COLUMNS),
             ],
             remainder="drop",
         )
-        model = LogisticRegression(
+
+    def _build_model(c_value: float = 1.0) -> LogisticRegression:
+        return LogisticRegression(
             max_iter=2000,
             C=float(c_value),
             class_weight="balanced",
         )
+
+    def _build_pipeline(c_value: float = 1.0) -> Pipeline:
         return Pipeline(
             steps=[
-                ("preprocess", preprocess),
-                ("model", model),
+                ("preprocess", _build_preprocess()),
+                ("model", _build_model(c_value)),
             ]
         )
 
@@ -173,10 +234,16 @@ def _fit_and_save_pipeline(X, labels: List[int], model_dir: Path, model_version:
         candidate_cs = [0.2, 0.5, 1.0, 2.0, 4.0]
         best_score = float("-inf")
 
+        # Only C varies across candidates, so fit/transform the preprocessing once
+        # (as Pipeline.fit would) and refit the bare model on the cached matrices.
+        sweep_preprocess = _build_preprocess()
+        X_train_matrix = sweep_preprocess.fit_transform(X_train)
+        X_valid_matrix = sweep_preprocess.transform(X_valid)
+
         for c_value in candidate_cs:
-            candidate = _build_pipeline(c_value)
-            candidate.fit(X_train, y_train)
-            valid_prob = candidate.predict_proba(X_valid)[:, 1]
+            candidate = _build_model(c_value)
+            candidate.fit(X_train_matrix, y_train)
+            valid_prob = candidate.predict_proba(X_valid_matrix)[:, 1]
             roc_auc = float(roc_auc_score(y_valid, valid_prob))
             avg_precision = float(average_precision_score(y_valid, valid_prob))
             brier = float(brier_score_loss(y_valid, valid_prob))
@@ -211,7 +278,12 @@ def _fit_and_save_pipeline(X, labels: List[int], model_dir: Path, model_version:
 
     # Prove the selected scoring estimator can score multiple instances.
     validation_instances = min(8, n)
-    validation_batch = X.sample(n=validation_instances, random_state=42) if n > validation_instances else X
+    if n > validation_instances:
+        # Generator.choice draws k indices without permuting all n rows as X.sample does.
+        sample_idx = np.random.default_rng(42).choice(n, size=validation_instances, replace=False)
+        validation_batch = X.iloc[sample_idx]
+    else:
+        validation_batch = X
     scoring_estimator = calibrator or pipeline
     validation_probs = scoring_estimator.predict_proba(validation_batch)[:, 1]
     if len(validation_probs) != validation_instances:
@@ -305,15 +377,15 @@ def train_and_save(
 
     if csv_path is None:
         csv_path = base_dir / "risk_scoring" / "data" / "diabetic_data.csv"
-    rows, labels = _build_training_rows_from_csv(
+    X, labels = _build_training_rows_from_csv(
         Path(csv_path),
         max_rows=max_rows,
         random_state=random_state,
     )
-    positives = int(sum(labels))
+    positives = int(labels.sum())
 
-    if len(rows) < min_rows:
-        raise RuntimeError(f"Not enough patients to train: rows={len(rows)}, required>={min_rows}.")
+    if len(X) < min_rows:
+        raise RuntimeError(f"Not enough patients to train: rows={len(X)}, required>={min_rows}.")
     if positives < 1:
         raise RuntimeError("Need at least one positive label in training CSV.")
     if positives < min_positives and not allow_low_positives:
@@ -322,7 +394,6 @@ def train_and_save(
             f"required>={min_positives}. Use a larger CSV slice or lower --min-positives."
         )
 
-    X = feature_dicts_to_dataframe(rows)
     if model_dir is None:
         model_dir = base_dir / "risk_scoring" / "artifacts"
     model_version = datetime.utcnow().strftime("risk-v3-%Y%m%d%H%M%S")